@@ -9,6 +9,33 @@ class DataAlchemistAgent:
         # default to a no-op logger if none provided (avoids printing during tests)
         self.log = log_fn or (lambda *a, **k: None)
 
+    @staticmethod
+    def synthesize(qtext) -> Dict:
+        """
+        Build the synthetic dataset for a question text (pure CPU, no I/O).
+        """
+        # create a small synthetic dataset (deterministic-ish using hash of question)
+        seed = abs(hash(qtext)) % (2**32) if qtext else random.randint(0, 2**32 - 1)
+        rnd = random.Random(seed)
+
+        rows = []
+        # synthesize N rows between 6 and 12
+        n = 8 + (seed % 5)
+        for i in range(1, n + 1):
+            feature = round(rnd.uniform(0.0, 1.0), 4)
+            # simple label rule correlated with feature + noise
+            label = 1 if feature + rnd.uniform(-0.15, 0.15) > 0.5 else 0
+            rows.append({"id": i, "feature": feature, "label": label})
+
+        return {
+            "rows": rows,
+            "meta": {
+                "sources": ["synthetic://generated", "example.pdf"],
+                "question": qtext,
+                "n_rows": len(rows),
+            },
+        }
+
     async def run(self, question: Any) -> Dict:
         """
         Simulate collecting / synthesizing a small dataset for the given question.
@@ -31,27 +58,8 @@ class DataAlchemistAgent:
             # simulate some I/O / wait
             await asyncio.sleep(0.8)
 
-            # create a small synthetic dataset (deterministic-ish using hash of question)
-            seed = abs(hash(qtext)) % (2**32) if qtext else random.randint(0, 2**32 - 1)
-            rnd = random.Random(seed)
-
-            rows = []
-            # synthesize N rows between 6 and 12
-            n = 8 + (seed % 5)
-            for i in range(1, n + 1):
-                feature = round(rnd.uniform(0.0, 1.0), 4)
-                # simple label rule correlated with feature + noise
-                label = 1 if feature + rnd.uniform(-0.15, 0.15) > 0.5 else 0
-                rows.append({"id": i, "feature": feature, "label": label})
-
-            dataset = {
-                "rows": rows,
-                "meta": {
-                    "sources": ["synthetic://generated", "example.pdf"],
-                    "question": qtext,
-                    "n_rows": len(rows),
-                },
-            }
+            dataset = self.synthesize(qtext)
+            rows = dataset["rows"]
 
             # store to memory (assuming memory has add method)
             try:
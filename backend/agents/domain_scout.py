@@ -1,9 +1,21 @@
 # backend/agents/domain_scout.py
 from typing import List, Dict
+import os
 import json
 import re
+import asyncio
 from ..tools.llm_client import generate
 
+# Queries used to ground the scout in recent material before asking the LLM
+SCOUT_QUERIES = [
+    "emerging research topics machine learning",
+    "new interdisciplinary research directions",
+    "recent breakthroughs arxiv survey",
+]
+
+# How many of the top web results to fetch (and add to the local index); 0 = snippets only
+SCOUT_FETCH_PAGES = int(os.getenv("SCOUT_FETCH_PAGES", "5"))
+
 def clean_json(text: str) -> str:
     """
     Attempt to extract a JSON object or array from model output.
@@ -60,15 +72,82 @@ def clean_json(text: str) -> str:
 
 
 class DomainScoutAgent:
-    def __init__(self, memory, log_fn=None):
+    def __init__(self, memory, log_fn=None, search=None, crawler=None):
         self.memory = memory
         self.log = log_fn or (lambda m: None)
+        # optional tools.web_search.SearchClient used for grounding
+        self.search = search
+        # optional shared tools.crawler.AsyncCrawler for fetching result pages
+        self.crawler = crawler
+
+    async def _gather_evidence(self, max_items: int = 8) -> List[Dict]:
+        # no providers configured (the default): skip grounding entirely
+        if self.search is None or not getattr(self.search, "providers", None):
+            return []
+        try:
+            results = await self.search.search_many(SCOUT_QUERIES, max_results=5)
+        except Exception as e:
+            self.log(f"DomainScout: search failed: {e}")
+            return []
+        self.log(f"DomainScout: {len(results)} search results for grounding")
+        try:
+            if hasattr(self.memory, "add"):
+                self.memory.add("search_results", results)
+        except Exception:
+            pass
+        evidence = results[:max_items]
+        await self._fetch_pages(evidence)
+        return evidence
+
+    async def _fetch_pages(self, evidence: List[Dict]):
+        """
+        Fetch the top web results with the shared crawler, add them to the local
+        search index and use the page text where a result has no snippet.
+        Stub / local-index results are skipped (fake URLs / already indexed).
+        """
+        urls = [
+            r["url"] for r in evidence
+            if r.get("provider") not in ("stub", "local") and str(r.get("url", "")).startswith(("http://", "https://"))
+        ][:SCOUT_FETCH_PAGES]
+        if not urls or self.crawler is None:
+            return
+        from ..tools.scraper import html_to_text
+        from ..tools.search_index import get_index, index_html
+
+        try:
+            pages = await self.crawler.fetch_many(urls)
+        except Exception as e:
+            self.log(f"DomainScout: page fetch failed: {e}")
+            return
+
+        loop = asyncio.get_running_loop()
+        titles = {r.get("url"): r.get("title", "") for r in evidence}
+        fetched = 0
+        for url, html in pages.items():
+            if not html:
+                continue
+            fetched += 1
+            try:
+                await loop.run_in_executor(None, index_html, get_index(), url, html, titles.get(url, ""))
+            except Exception as e:
+                self.log(f"DomainScout: indexing {url} failed: {e}")
+        for r in evidence:
+            html = pages.get(r.get("url"))
+            if html and not r.get("snippet"):
+                r["snippet"] = (await loop.run_in_executor(None, html_to_text, html))[:300]
+        self.log(f"DomainScout: fetched and indexed {fetched}/{len(urls)} result pages")
 
     async def run(self) -> List[Dict]:
         self.log("DomainScout: searching for emerging domains...")
 
+        evidence = await self._gather_evidence()
+        context = ""
+        if evidence:
+            lines = [f"- {r.get('title', '')}: {r.get('snippet', '')} ({r.get('url', '')})" for r in evidence]
+            context = "Recent material found by web search:\n" + "\n".join(lines) + "\n\n"
+
         # STRICT JSON PROMPT
-        prompt = (
+        prompt = context + (
             "You are a research scout. List 3 emerging research topics (short names) with a confidence score (0-1). "
             "Return ONLY valid JSON (no extra commentary) with the key 'domains' as a list of objects: "
             "e.g. {\"domains\": [{\"name\": \"...\", \"confidence\": 0.72}, ...]}. "
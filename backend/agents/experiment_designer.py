@@ -3,6 +3,7 @@ import asyncio
 import numpy as np
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
+from ..models.schemas import Dataset
 
 class ExperimentDesignerAgent:
     def __init__(self, memory, log_fn=None):
@@ -25,7 +26,10 @@ class ExperimentDesignerAgent:
     async def run(self, dataset, question):
         try:
             self.log("ExperimentDesigner: preparing experiment")
-            rows = dataset.get("rows", []) if isinstance(dataset, dict) else []
+            if isinstance(dataset, Dataset):
+                rows = dataset.rows
+            else:
+                rows = dataset.get("rows", []) if isinstance(dataset, dict) else []
             X = np.array([[r.get('feature', 0.0)] for r in rows])
             y = np.array([r.get('label', 0) for r in rows])
 
@@ -1,21 +1,190 @@
+import os
+import json
+import time
 import uuid
 import asyncio
+import hashlib
 from collections import defaultdict
+from contextlib import asynccontextmanager
+from ..tools import telemetry
+from ..tools import usage
+from ..models.schemas import Paper, Dataset
 from ..tools.memory_manager import MemoryManager
-from .domain_scout import DomainScoutAgent
-from .question_generator import QuestionGeneratorAgent
-from .data_alchemist import DataAlchemistAgent
-from .experiment_designer import ExperimentDesignerAgent
-from .critic_agent import CriticAgent
+from ..tools.render_cache import RenderCache, ResultCache, etag_matches
+from ..tools.run_store import RunStore
+from ..tools.web_search import get_search_client
+from . import registry
+
+# Checkpointed stages per mode, in pipeline order
+STAGES = {
+    "default": ("scout", "questions", "data", "experiment", "critic"),
+    "explore": ("scout", "questions"),
+    "simulate": ("data", "experiment", "critic"),
+    "summarize": (),
+}
+ACTIVE_PHASES = ("initialized", "queued", "running")
+
+# Stage outputs kept (and checkpointed) as typed models rather than plain dicts
+CHECKPOINT_MODELS = {"data": Dataset}
+
+# Max pipelines running at once (0 = unlimited); extra runs wait in phase "queued"
+MAX_CONCURRENT_RUNS = int(os.getenv("MAX_CONCURRENT_RUNS", "0"))
+
+# Completed runs younger than this (seconds) are returned for identical specs; 0 disables
+RUN_DEDUP_TTL = float(os.getenv("RUN_DEDUP_TTL", "300"))
+
+
+def spec_fingerprint(mode: str, budget: usage.Budget = None, deadline: float = None) -> str:
+    """
+    Canonical hash of everything that determines a run's output. The deadline
+    is included because it decides whether the run finishes at all: a request
+    must never attach to a run that would stop earlier or later than it asked.
+    """
+    spec = {
+        "mode": mode,
+        "budget": budget.to_dict() if budget else None,
+        "deadline": float(deadline) if deadline else None,
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised by Orchestrator._stage when a run has used its whole budget.
+    """
+
+    def __init__(self, used: float):
+        super().__init__(f"budget {used:.0%} used")
+        self.used = used
 
 
 class Orchestrator:
-    def __init__(self):
+    def __init__(self, store: RunStore = None):
         self.runs = {}
         self.status = defaultdict(dict)
         self.memory = MemoryManager()
+        # rendered downloads, keyed by (run_id, format, paper version)
+        self.renders = RenderCache()
+        # encoded /result bodies, keyed by (run_id, media type, paper version)
+        self.bodies = ResultCache()
+        self.versions = {}
+        # shared so the result cache and rate limits apply across runs
+        self.search = get_search_client()
+        # likewise shared (connection pool, per-host limits, robots.txt); created on first use
+        self._crawler = None
+        self.budgets = {}
+        self.tasks = {}
+        # spec fingerprint -> latest run_id with that spec
+        self.fingerprints = {}
+        self.run_slots = asyncio.Semaphore(MAX_CONCURRENT_RUNS) if MAX_CONCURRENT_RUNS > 0 else None
+        # stage checkpoints + final papers, persisted so runs survive restarts
+        self.store = store if store is not None else RunStore()
+        self._restore()
+
+    def _restore(self):
+        """
+        Reload the most recent persisted runs (older ones load on first access).
+        """
+        for run_id, record in self.store.load_recent().items():
+            self._restore_record(run_id, record)
 
-    def start(self, mode: str = "default"):
+    def _restore_record(self, run_id, record):
+        """
+        Rebuild in-memory state for a persisted run. Runs that were active when
+        the worker stopped are marked "interrupted" and can be resumed.
+        """
+        status = record["status"]
+        checkpoints = record.setdefault("checkpoints", {})
+        for stage, model in CHECKPOINT_MODELS.items():
+            if isinstance(checkpoints.get(stage), dict):
+                checkpoints[stage] = model.from_dict(checkpoints[stage])
+        if status.get("phase") in ACTIVE_PHASES:
+            status["phase"] = "interrupted"
+        status["stage"] = None
+        if status.get("usage"):
+            usage.ledger.runs[run_id] = status["usage"]
+        status["usage"] = usage.ledger.open(run_id)
+        self.status[run_id] = status
+        if status.get("budget"):
+            self.budgets[run_id] = usage.Budget(**status["budget"])
+        if record.get("paper"):
+            record["paper"] = self.runs[run_id] = Paper.from_dict(record["paper"])
+            self.versions[run_id] = 1
+        if status.get("fingerprint"):
+            latest = self.fingerprints.get(status["fingerprint"])
+            if latest is None or status.get("created_at", 0) > self.status[latest].get("created_at", 0):
+                self.fingerprints[status["fingerprint"]] = run_id
+        return status
+
+    async def ensure_loaded(self, *run_ids):
+        """
+        Load runs that were not preloaded without blocking the event loop: the
+        disk reads run in an executor and in-memory state is rebuilt back on the
+        loop. Async callers await this before the sync accessors below, so those
+        only ever find runs in memory.
+        """
+        missing = [r for r in run_ids if r not in self.status and r in self.store.touched]
+        if not missing:
+            return
+        loop = asyncio.get_running_loop()
+        records = await loop.run_in_executor(None, lambda: {r: self.store.load(r) for r in missing})
+        for run_id, record in records.items():
+            # skip runs restored (or started) by another request while we read
+            if record is not None and run_id not in self.status:
+                self._restore_record(run_id, record)
+
+    def _lookup(self, run_id):
+        """
+        Status dict of a run, loading it from the store if it was not preloaded.
+        None if the run is unknown. The fallback load blocks and mutates state,
+        so call this on the loop thread (after ensure_loaded() in request handlers).
+        """
+        status = self.status.get(run_id)
+        if status is None:
+            record = self.store.load(run_id)
+            if record is not None:
+                status = self._restore_record(run_id, record)
+        return status
+
+    def _prune(self, keep):
+        """
+        Apply the store's retention limits and drop evicted runs from memory.
+        """
+        for run_id in self.store.prune(keep=set(self.tasks) | set(keep)):
+            self.runs.pop(run_id, None)
+            self.status.pop(run_id, None)
+            self.versions.pop(run_id, None)
+            self.budgets.pop(run_id, None)
+            self.renders.invalidate(run_id)
+            self.bodies.invalidate(run_id)
+            usage.ledger.runs.pop(run_id, None)
+            for fingerprint in [f for f, r in self.fingerprints.items() if r == run_id]:
+                del self.fingerprints[fingerprint]
+
+    def submit(self, mode: str = "default", budget: usage.Budget = None, deadline: float = None, force: bool = False):
+        """
+        Start a run unless an identical one can be reused. Returns (run_id, how)
+        where how is "started", "attached" (identical run still in flight) or
+        "cached" (identical run completed within RUN_DEDUP_TTL). force=True
+        always starts a new run. Runs only match with the same mode, budget and
+        deadline.
+        """
+        fingerprint = spec_fingerprint(mode, budget, deadline)
+        existing = None if force else self.fingerprints.get(fingerprint)
+        if existing is not None:
+            status = self.status.get(existing, {})
+            if status.get("phase") in ACTIVE_PHASES:
+                return existing, "attached"
+            completed_at = status.get("completed_at")
+            if status.get("phase") == "completed" and completed_at and time.time() - completed_at <= RUN_DEDUP_TTL:
+                return existing, "cached"
+
+        run_id = self.start(mode=mode, budget=budget, deadline=deadline)
+        self.status[run_id]["fingerprint"] = fingerprint
+        self.fingerprints[fingerprint] = run_id
+        return run_id, "started"
+
+    def start(self, mode: str = "default", budget: usage.Budget = None, deadline: float = None):
         """
         Start a pipeline run.
 
@@ -24,27 +193,228 @@ class Orchestrator:
           - "explore": domain exploration + question generation (fast)
           - "summarize": summarization mode (stub - placeholder)
           - "simulate": run experiment simulation (data alchemy + experiment designer)
+
+        budget: optional usage.Budget (tokens / cost / wall time). Once any limit is
+        BUDGET_SOFT_LIMIT used, LLM calls switch to LLM_FALLBACK_MODEL and the critic
+        is skipped; once one is fully used, the run stops before its next stage with
+        phase "budget_exceeded" (checkpoints are kept, so it can be resumed with a
+        larger budget).
+
+        deadline: optional wall-clock limit in seconds; the run is cancelled when it expires.
         """
         run_id = str(uuid.uuid4())
-        self.status[run_id] = {"phase": "initialized", "logs": [], "mode": mode}
+        self.status[run_id] = {
+            "phase": "initialized",
+            "logs": [],
+            "mode": mode,
+            "created_at": time.time(),
+            # live per-run token/cost totals, updated by llm_client.generate()
+            "usage": usage.ledger.open(run_id),
+        }
+        if deadline:
+            self.status[run_id]["deadline_seconds"] = deadline
+        if budget:
+            self.budgets[run_id] = budget
+            self.status[run_id]["budget"] = budget.to_dict()
+        # the record shares the live status dict, so snapshots include phase/logs/usage
+        self.store.create(run_id, status=self.status[run_id])
+        self._prune(keep=(run_id,))
         # start pipeline in background
-        asyncio.create_task(self._pipeline(run_id, mode=mode))
+        self._launch(run_id, mode)
+        return run_id
+
+    def _launch(self, run_id, mode):
+        task = asyncio.create_task(self._pipeline(run_id, mode=mode))
+        self.tasks[run_id] = task
+
+        def _done(t):
+            if self.tasks.get(run_id) is t:
+                del self.tasks[run_id]
+            # cancelled before its first step: _pipeline's handlers never ran
+            if t.cancelled() and self.status[run_id].get("phase") in ACTIVE_PHASES:
+                self._log(run_id, "Run cancelled")
+                self.status[run_id]["phase"] = "cancelled"
+                data = self.store.snapshot(run_id)
+                asyncio.get_running_loop().run_in_executor(None, self.store.write, run_id, data)
+
+        task.add_done_callback(_done)
+
+    def cancel(self, run_id: str) -> bool:
+        """
+        Cancel an active run. The CancelledError propagates into in-flight LLM
+        calls and stage awaits, releasing their concurrency slots. Returns False
+        if the run exists but is no longer active.
+        """
+        if self._lookup(run_id) is None:
+            raise KeyError(run_id)
+        task = self.tasks.get(run_id)
+        if task is None or task.done():
+            return False
+        self.status[run_id]["cancel_requested"] = True
+        task.cancel()
+        return True
+
+    def resume(self, run_id: str, from_stage: str = None, budget: usage.Budget = None, deadline: float = None):
+        """
+        Restart a finished, failed or interrupted run from its first stage without
+        a checkpoint. `from_stage` discards that stage's checkpoint and all later
+        ones, so downstream stages rerun (e.g. with a new budget) while upstream
+        LLM outputs are reused.
+        """
+        status = self._lookup(run_id)
+        if status is None:
+            raise KeyError(run_id)
+        record = self.store.get(run_id)
+        if status.get("phase") in ACTIVE_PHASES:
+            raise RuntimeError(f"run {run_id} is still active")
+
+        mode = status.get("mode", "default")
+        if from_stage:
+            stages = STAGES.get(mode, ())
+            if from_stage not in stages:
+                raise ValueError(f"unknown stage {from_stage!r} for mode {mode!r}")
+            for stage in stages[stages.index(from_stage):]:
+                record["checkpoints"].pop(stage, None)
+
+        if budget:
+            self.budgets[run_id] = budget
+            status["budget"] = budget.to_dict()
+        if deadline:
+            status["deadline_seconds"] = deadline
+        status.pop("cancel_requested", None)
+
+        status["phase"] = "initialized"
+        self._log(run_id, f"Resuming run (from_stage={from_stage or 'first incomplete'})")
+        self._launch(run_id, mode)
         return run_id
 
+    async def _persist(self, run_id):
+        data = self.store.snapshot(run_id)
+        await asyncio.get_running_loop().run_in_executor(None, self.store.write, run_id, data)
+
+    @asynccontextmanager
+    async def _slot(self, run_id):
+        """
+        Hold one of the MAX_CONCURRENT_RUNS slots for the duration of a run.
+        """
+        if self.run_slots is None:
+            yield
+            return
+        if self.run_slots.locked():
+            self.status[run_id]["phase"] = "queued"
+            self._log(run_id, "Waiting for a free run slot")
+        async with self.run_slots:
+            yield
+
+    async def _run_in_slot(self, run_id, mode):
+        async with self._slot(run_id):
+            await self._run_pipeline(run_id, mode)
+
     async def _pipeline(self, run_id: str, mode: str = "default"):
+        # everything below (stages, LLM calls) is traced as children of this span
+        telemetry.current_run.set(run_id)
+        deadline = self.status[run_id].get("deadline_seconds")
+        with telemetry.span("pipeline_run", labels={"mode": mode}) as span:
+            try:
+                # the deadline covers time spent queued for a slot as well
+                if deadline:
+                    await asyncio.wait_for(self._run_in_slot(run_id, mode), deadline)
+                else:
+                    await self._run_in_slot(run_id, mode)
+            except asyncio.TimeoutError:
+                self._log(run_id, f"Deadline of {deadline}s exceeded, run stopped")
+                self.status[run_id]["phase"] = "deadline_exceeded"
+                await self._persist(run_id)
+            except asyncio.CancelledError:
+                self._log(run_id, "Run cancelled")
+                self.status[run_id]["phase"] = "cancelled"
+                await self._persist(run_id)
+                raise
+            finally:
+                span.labels["phase"] = self.status[run_id].get("phase")
+
+    async def _stage(self, run_id, mode, stage, fn, *args):
+        """
+        Run one pipeline stage (`await fn(*args)`) inside a telemetry span,
+        attributing LLM usage to `stage` and applying the run's budget policy
+        (raises BudgetExceeded when the budget is used up).
+        The output is checkpointed; if a checkpoint already exists it is returned
+        without running the stage.
+        """
+        checkpoints = self.store.get(run_id)["checkpoints"]
+        if stage in checkpoints:
+            self._log(run_id, f"Reusing checkpoint: {stage}")
+            return checkpoints[stage]
+
+        budget = self.budgets.get(run_id)
+        if budget:
+            used = budget.fraction_used(usage.ledger.open(run_id))
+            if used >= 1.0:
+                raise BudgetExceeded(used)
+            if used >= usage.BUDGET_SOFT_LIMIT:
+                if stage == "critic":
+                    self._log(run_id, f"Budget {used:.0%} used: skipping critic")
+                    return {"critique": "Skipped: run budget nearly exhausted", "confidence": None, "skipped": True}
+                if usage.model_override.get() is None:
+                    self._log(run_id, f"Budget {used:.0%} used: switching to {usage.LLM_FALLBACK_MODEL}")
+                    usage.model_override.set(usage.LLM_FALLBACK_MODEL)
+
+        token = usage.current_agent.set(stage)
+        self.status[run_id]["stage"] = stage
         try:
+            with telemetry.span("pipeline_stage", labels={"stage": stage, "mode": mode}):
+                result = await fn(*args)
+        finally:
+            usage.current_agent.reset(token)
+            self.status[run_id]["stage"] = None
+
+        model = CHECKPOINT_MODELS.get(stage)
+        if model is not None and isinstance(result, dict):
+            result = model.from_dict(result)
+        checkpoints[stage] = result
+        await self._persist(run_id)
+        return result
+
+    @property
+    def crawler(self):
+        if self._crawler is None:
+            from ..tools.crawler import AsyncCrawler
+            self._crawler = AsyncCrawler()
+        return self._crawler
+
+    async def close(self):
+        """
+        Release shared network resources (call on shutdown).
+        """
+        if self._crawler is not None:
+            await self._crawler.close()
+
+    def _agent(self, name, run_id):
+        """
+        Build an agent from the lazy registry (its module is imported on first use).
+        """
+        kwargs = {}
+        if name == "scout":
+            kwargs["search"] = self.search
+            # pages are only fetched for web results, so skip the crawler without providers
+            kwargs["crawler"] = self.crawler if self.search.providers else None
+        return registry.get(name)(self.memory, log_fn=lambda m: self._log(run_id, m), **kwargs)
+
+    async def _run_pipeline(self, run_id: str, mode: str = "default"):
+        try:
+            self.status[run_id]["phase"] = "running"
             self._log(run_id, f"Starting pipeline (mode={mode})")
 
             # ---------- MODE: explore ----------
             if mode == "explore":
                 self._log(run_id, "DomainScout: searching for emerging domains...")
-                scout = DomainScoutAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
-                domains = await scout.run()
+                scout = self._agent("scout", run_id)
+                domains = await self._stage(run_id, mode, "scout", scout.run)
                 self._log(run_id, f"Scout found: {domains}")
 
                 self._log(run_id, "QuestionGenerator: generating questions...")
-                qgen = QuestionGeneratorAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
-                questions = await qgen.run(domains)
+                qgen = self._agent("questions", run_id)
+                questions = await self._stage(run_id, mode, "questions", qgen.run, domains)
                 self._log(run_id, f"Questions: {questions}")
 
                 chosen_q = questions[0] if questions else "Exploration result"
@@ -57,9 +427,7 @@ class Orchestrator:
                     "critique": {},
                 }
 
-                self.runs[run_id] = paper
-                self.status[run_id]["phase"] = "completed"
-                self._log(run_id, "Explore pipeline finished")
+                self._complete(run_id, paper, "Explore pipeline finished")
                 return
 
             # ---------- MODE: summarize ----------
@@ -74,31 +442,25 @@ class Orchestrator:
                     "results": {},
                     "critique": {},
                 }
-                self.runs[run_id] = paper
-                self.status[run_id]["phase"] = "completed"
-                self._log(run_id, "Summarization completed (placeholder)")
+                self._complete(run_id, paper, "Summarization completed (placeholder)")
                 return
 
             # ---------- MODE: simulate ----------
             if mode == "simulate":
                 self._log(run_id, "Simulation: running data alchemy and experiment designer...")
-                da = DataAlchemistAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
+                da = self._agent("data", run_id)
                 # Use a placeholder question/prompt for simulation
                 sim_prompt = "simulate_experiment"
-                dataset = await da.run(sim_prompt)
-                # log dataset shape/info if possible
-                try:
-                    rows = len(dataset.get("rows", []))
-                except Exception:
-                    rows = None
+                dataset = await self._stage(run_id, mode, "data", da.run, sim_prompt)
+                rows = len(dataset.rows)
                 self._log(run_id, f"Simulated dataset created (rows={rows})")
 
-                ed = ExperimentDesignerAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
-                results = await ed.run(dataset, sim_prompt)
+                ed = self._agent("experiment", run_id)
+                results = await self._stage(run_id, mode, "experiment", ed.run, dataset, sim_prompt)
                 self._log(run_id, f"Simulation results: {results.get('summary', results)}")
 
-                critic = CriticAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
-                critique = await critic.run(results)
+                critic = self._agent("critic", run_id)
+                critique = await self._stage(run_id, mode, "critic", critic.run, results)
                 self._log(run_id, f"Critic: {critique}")
 
                 paper = {
@@ -107,40 +469,35 @@ class Orchestrator:
                     "results": results,
                     "critique": critique,
                 }
-                self.runs[run_id] = paper
-                self.status[run_id]["phase"] = "completed"
-                self._log(run_id, "Simulation pipeline finished")
+                self._complete(run_id, paper, "Simulation pipeline finished")
                 return
 
             # ---------- DEFAULT: full pipeline ----------
             # Keep your original pipeline behaviour here (scout -> qgen -> data -> exp -> critic -> paper)
             self._log(run_id, "Running full default pipeline")
 
-            scout = DomainScoutAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
-            domains = await scout.run()
+            scout = self._agent("scout", run_id)
+            domains = await self._stage(run_id, mode, "scout", scout.run)
             self._log(run_id, f"Scout found: {domains}")
 
-            qgen = QuestionGeneratorAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
-            questions = await qgen.run(domains)
+            qgen = self._agent("questions", run_id)
+            questions = await self._stage(run_id, mode, "questions", qgen.run, domains)
             self._log(run_id, f"Questions: {questions}")
 
             chosen_q = questions[0] if questions else "Untitled question"
             self._log(run_id, f"Chosen question: {chosen_q}")
 
-            data_agent = DataAlchemistAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
-            dataset = await data_agent.run(chosen_q)
-            try:
-                num_rows = len(dataset.get("rows", []))
-            except Exception:
-                num_rows = None
+            data_agent = self._agent("data", run_id)
+            dataset = await self._stage(run_id, mode, "data", data_agent.run, chosen_q)
+            num_rows = len(dataset.rows)
             self._log(run_id, f"Dataset ready: rows={num_rows}")
 
-            exp_agent = ExperimentDesignerAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
-            results = await exp_agent.run(dataset, chosen_q)
+            exp_agent = self._agent("experiment", run_id)
+            results = await self._stage(run_id, mode, "experiment", exp_agent.run, dataset, chosen_q)
             self._log(run_id, f"Experiment results summary: {results.get('summary', {})}")
 
-            critic = CriticAgent(self.memory, log_fn=lambda m: self._log(run_id, m))
-            critique = await critic.run(results)
+            critic = self._agent("critic", run_id)
+            critique = await self._stage(run_id, mode, "critic", critic.run, results)
             self._log(run_id, f"Critic: {critique}")
 
             paper = {
@@ -150,22 +507,146 @@ class Orchestrator:
                 "critique": critique,
             }
 
-            self.runs[run_id] = paper
-            self.status[run_id]["phase"] = "completed"
-            self._log(run_id, "Pipeline finished")
+            self._complete(run_id, paper, "Pipeline finished")
+
+        except BudgetExceeded as e:
+            self._log(run_id, f"Budget exhausted ({e.used:.0%} used), run stopped")
+            self.status[run_id]["phase"] = "budget_exceeded"
+            await self._persist(run_id)
 
         except Exception as e:
             # Log the error and set phase to error so frontend can show status
             self._log(run_id, f"Pipeline error: {repr(e)}")
             self.status[run_id]["phase"] = "error"
+            await self._persist(run_id)
+
+    def _complete(self, run_id, paper, message):
+        """
+        Store the final paper, mark the run completed and pre-render its downloads.
+        """
+        paper = Paper.from_dict(paper)
+        self.runs[run_id] = paper
+        version = self.versions.get(run_id, 0) + 1
+        self.versions[run_id] = version
+        self.renders.invalidate(run_id)
+        self.bodies.invalidate(run_id)
+        self.status[run_id]["phase"] = "completed"
+        self.status[run_id]["completed_at"] = time.time()
+        self._log(run_id, message)
+        self.store.get(run_id)["paper"] = paper
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, self.store.write, run_id, self.store.snapshot(run_id))
+        # rendering is CPU-bound (json pretty-printing, reportlab layout), keep it off the loop
+        loop.run_in_executor(None, self.renders.prerender, run_id, version, paper)
 
     def _log(self, run_id, message):
         # add to logs (create run entry if missing)
         self.status.setdefault(run_id, {}).setdefault("logs", []).append(message)
 
-    def get_status(self, run_id):
-        # Return the full status dict (phase, logs, mode if present)
-        return self.status.get(run_id, {"phase": "unknown", "logs": []})
+    def _progress(self, run_id):
+        """
+        Per-stage state (pending / running / done) and overall percent complete.
+        Stages report no partial progress: a stage's percent is 0 until its
+        checkpoint exists and 100 after, so the overall percent moves in steps of
+        one stage.
+        """
+        status = self.status[run_id]
+        stages = STAGES.get(status.get("mode"), ())
+        record = self.store.get(run_id)
+        done = record["checkpoints"] if record else {}
+        finished = status.get("phase") == "completed"
+        current = status.get("stage")
+
+        items = []
+        for stage in stages:
+            if finished or stage in done:
+                items.append({"name": stage, "state": "done", "percent": 100})
+            else:
+                items.append({"name": stage, "state": "running" if stage == current else "pending", "percent": 0})
+        n_done = sum(1 for it in items if it["state"] == "done")
+        if finished:
+            percent = 100
+        else:
+            percent = round(100 * n_done / len(stages)) if stages else 0
+        return {"percent": percent, "stage": current, "stages": items}
+
+    def get_status(self, run_id, since: int = None, limit: int = None):
+        """
+        Without `since`: the full status dict (phase, logs, mode, usage, ...) plus progress.
+
+        With `since`: an incremental view containing only log entries with seq > since
+        (at most `limit`), each as {"seq", "message"}. A log's seq is its 1-based
+        position in the append-only log, so pass back `next_seq` on the next poll.
+        """
+        status = self._lookup(run_id)
+        if status is None:
+            if since is None:
+                return {"phase": "unknown", "logs": []}
+            return {"run_id": run_id, "phase": "unknown", "logs": [], "next_seq": 0}
+
+        if since is None:
+            return {**status, "progress": self._progress(run_id)}
+
+        logs = status.get("logs", [])
+        start = max(0, since)
+        end = len(logs) if limit is None else min(len(logs), start + limit)
+        return {
+            "run_id": run_id,
+            "phase": status.get("phase"),
+            "mode": status.get("mode"),
+            "progress": self._progress(run_id),
+            "logs": [{"seq": i + 1, "message": logs[i]} for i in range(start, end)],
+            "next_seq": end,
+        }
+
+    def get_status_many(self, run_ids):
+        """
+        Compact status (no logs) for many runs at once.
+        """
+        out = {}
+        for run_id in run_ids:
+            status = self._lookup(run_id)
+            if status is None:
+                out[run_id] = {"phase": "unknown"}
+                continue
+            out[run_id] = {
+                "phase": status.get("phase"),
+                "mode": status.get("mode"),
+                "percent": self._progress(run_id)["percent"],
+                "stage": status.get("stage"),
+                "log_count": len(status.get("logs", [])),
+            }
+        return out
 
     def get_result(self, run_id):
-        return self.runs.get(run_id, {})
+        """
+        The run's Paper, or None if it has not completed (or is unknown).
+        """
+        self._lookup(run_id)
+        return self.runs.get(run_id)
+
+    def get_result_body(self, run_id, media_type):
+        """
+        The run's paper encoded as `media_type` (JSON or msgpack), or None if it
+        has not completed (or is unknown).
+        """
+        paper = self.get_result(run_id)
+        if paper is None:
+            return None
+        body, _ = self.bodies.get(run_id, media_type, self.versions.get(run_id, 0), paper)
+        return body
+
+    def get_rendered(self, run_id, fmt, if_none_match=None):
+        """
+        Return (body, etag) for a completed run's download, or None if the run is unknown.
+        If `if_none_match` matches the current ETag, body is None and nothing is rendered.
+        """
+        paper = self.get_result(run_id)
+        if not paper:
+            return None
+        version = self.versions.get(run_id, 0)
+        if if_none_match:
+            etag = self.renders.etag(run_id, fmt, version, paper)
+            if etag_matches(if_none_match, etag):
+                return None, etag
+        return self.renders.get(run_id, fmt, version, paper)
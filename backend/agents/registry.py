@@ -0,0 +1,92 @@
+# backend/agents/registry.py
+import sys
+import time
+import logging
+import importlib
+import importlib.util
+import threading
+
+logger = logging.getLogger(__name__)
+
+# name -> (module relative to this package, class name). Modules are imported on
+# first use, so e.g. numpy/sklearn (experiment_designer) only load for runs that need them.
+AGENTS = {
+    "scout": (".domain_scout", "DomainScoutAgent"),
+    "questions": (".question_generator", "QuestionGeneratorAgent"),
+    "data": (".data_alchemist", "DataAlchemistAgent"),
+    "experiment": (".experiment_designer", "ExperimentDesignerAgent"),
+    "critic": (".critic_agent", "CriticAgent"),
+}
+
+# Optional heavy third-party modules used lazily by tools/ (warm() imports the installed ones)
+HEAVY_MODULES = (
+    "numpy",
+    "sklearn.linear_model",
+    "reportlab.pdfgen.canvas",
+    "pdfplumber",
+    "pytesseract",
+    "bs4",
+    "httpx",
+)
+
+_classes = {}
+_timings = {}
+_lock = threading.Lock()
+
+
+def _timed_import(name, package=None):
+    key = importlib.util.resolve_name(name, package) if name.startswith(".") else name
+    if key in sys.modules:
+        # already pulled in by something else; its cost was paid there
+        return sys.modules[key]
+    t0 = time.perf_counter()
+    module = importlib.import_module(key)
+    _timings.setdefault(key, round(time.perf_counter() - t0, 4))
+    return module
+
+
+def get(name):
+    """
+    Return the agent class registered under `name`, importing its module on first use.
+    """
+    cls = _classes.get(name)
+    if cls is not None:
+        return cls
+    module_name, class_name = AGENTS[name]
+    with _lock:
+        if name not in _classes:
+            module = _timed_import(module_name, package=__package__)
+            _classes[name] = getattr(module, class_name)
+            logger.info("Loaded agent %s in %.3fs", name, _timings.get(module.__name__, 0.0))
+    return _classes[name]
+
+
+def warm(agents=None, heavy=True):
+    """
+    Import agents (all by default) and installed heavy optional modules up front,
+    e.g. before a worker starts taking traffic. Missing optional modules are skipped.
+    """
+    for name in agents or AGENTS:
+        if name not in AGENTS:
+            logger.warning("warm: unknown agent %r", name)
+            continue
+        get(name)
+    if heavy:
+        for module_name in HEAVY_MODULES:
+            try:
+                _timed_import(module_name)
+            except ImportError:
+                _timings.setdefault(module_name, None)
+    return import_report()
+
+
+def import_report():
+    """
+    Seconds spent importing each lazily loaded module (None = not installed).
+    The first import of a module includes its dependencies that weren't loaded yet.
+    """
+    return {
+        "agents_loaded": sorted(_classes),
+        "timings": dict(_timings),
+        "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+    }
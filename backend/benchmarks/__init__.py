@@ -0,0 +1 @@
+# benchmark harness (python -m backend.benchmarks.run_benchmarks)
@@ -0,0 +1,244 @@
+# backend/benchmarks/run_benchmarks.py
+"""
+Benchmark harness for the pipeline and its hot paths.
+
+    python -m backend.benchmarks.run_benchmarks --out bench.json
+    python -m backend.benchmarks.run_benchmarks --out new.json --compare bench.json
+
+End-to-end runs use the offline mock LLM (tools/mock_llm.py) unless
+LLM_PROVIDER is already set; MOCK_LLM_* env vars shape its latency.
+Results are written as JSON so runs can be diffed with --compare.
+"""
+import os
+
+os.environ.setdefault("LLM_PROVIDER", "mock")
+os.environ.setdefault("MOCK_LLM_LATENCY", "lognormal:0.2:0.3")
+os.environ.setdefault("MOCK_LLM_TOKENS_PER_SEC", "200")
+# keep benchmark runs in memory unless a store directory is given explicitly
+os.environ.setdefault("RUN_STORE_DIR", "")
+os.environ.setdefault("SEARCH_PROVIDERS", "stub")
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import subprocess
+import statistics
+
+from ..agents.critic_agent import clean_json
+from ..agents.data_alchemist import DataAlchemistAgent
+from ..agents.experiment_designer import ExperimentDesignerAgent
+from ..agents.orchestrator import Orchestrator
+from ..tools.memory_manager import MemoryManager
+from ..tools.pdf_tools import markdown_from_paper, generate_pdf_from_text
+
+MODES = ["explore", "summarize", "simulate", "default"]
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def summarize(samples_s):
+    ms = [s * 1000.0 for s in samples_s]
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p50_ms": round(percentile(ms, 50), 4),
+        "p99_ms": round(percentile(ms, 99), 4),
+        "min_ms": round(min(ms), 4),
+    }
+
+
+def time_sync(fn, iterations):
+    fn()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+
+async def time_async(make_coro, iterations):
+    await make_coro()
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await make_coro()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+
+# ------------------------
+# Micro-benchmarks
+# ------------------------
+def sample_paper():
+    return {
+        "title": "Mini paper for a benchmark question",
+        "abstract": "Auto-generated abstract...",
+        "results": {
+            "summary": {"accuracy": 0.875},
+            "model_coef": [[1.2345678901234]],
+            "n_rows": 12,
+            "domains": [{"name": f"Domain {i}", "confidence": 0.5 + i / 100} for i in range(20)],
+        },
+        "critique": {"critique": "Small sample. " * 40, "confidence": 0.7},
+    }
+
+
+def micro_benchmarks(iterations):
+    results = {}
+
+    fenced = "Here you go:\n```json\n" + json.dumps({"domains": [{"name": "x" * 40, "confidence": 0.5}] * 20}) + "\n```"
+    bare = "Sure! " * 50 + json.dumps({"questions": ["q" * 80] * 10}) + " Hope this helps."
+    results["clean_json.fenced"] = time_sync(lambda: clean_json(fenced), iterations * 10)
+    results["clean_json.bracket"] = time_sync(lambda: clean_json(bare), iterations * 10)
+
+    results["data_alchemist.synthesize"] = time_sync(
+        lambda: DataAlchemistAgent.synthesize("Does X improve Y?"), iterations * 10
+    )
+
+    dataset = DataAlchemistAgent.synthesize("Does X improve Y?")
+    designer = ExperimentDesignerAgent(MemoryManager())
+    results["experiment_designer.run"] = asyncio.run(
+        time_async(lambda: designer.run(dataset, "Does X improve Y?"), iterations)
+    )
+
+    paper = sample_paper()
+    results["markdown_from_paper"] = time_sync(lambda: markdown_from_paper(paper), iterations * 10)
+
+    md = markdown_from_paper(paper)
+    try:
+        results["generate_pdf_from_text"] = time_sync(lambda: generate_pdf_from_text(md), iterations)
+    except Exception as e:
+        results["generate_pdf_from_text"] = {"error": str(e)}
+
+    return results
+
+
+# ------------------------
+# End-to-end
+# ------------------------
+async def _run_batch(mode, concurrency):
+    """
+    Start `concurrency` runs at once and wait for all of them.
+    Returns (wall_seconds, per-run latencies, error count).
+    """
+    orch = Orchestrator()
+    t0 = time.perf_counter()
+    pending = {orch.start(mode=mode): t0 for _ in range(concurrency)}
+    latencies, errors = [], 0
+    while pending:
+        await asyncio.sleep(0.005)
+        now = time.perf_counter()
+        for run_id in list(pending):
+            phase = orch.get_status(run_id).get("phase")
+            if phase in ("completed", "error"):
+                latencies.append(now - pending.pop(run_id))
+                errors += phase == "error"
+    return time.perf_counter() - t0, latencies, errors
+
+
+def e2e_benchmarks(modes, levels, rounds):
+    results = {}
+    for mode in modes:
+        results[mode] = {}
+        for level in levels:
+            walls, latencies, errors = [], [], 0
+            for _ in range(rounds):
+                wall, lats, errs = asyncio.run(_run_batch(mode, level))
+                walls.append(wall)
+                latencies.extend(lats)
+                errors += errs
+            stats = summarize(latencies)
+            stats["throughput_rps"] = round(level * rounds / sum(walls), 3)
+            stats["errors"] = errors
+            results[mode][str(level)] = stats
+            print(f"  e2e {mode:<9} c={level:<4} p50={stats['p50_ms']:.1f}ms "
+                  f"p99={stats['p99_ms']:.1f}ms rps={stats['throughput_rps']}", file=sys.stderr)
+    return results
+
+
+# ------------------------
+# Reporting
+# ------------------------
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "llm_provider": os.environ.get("LLM_PROVIDER"),
+        "mock_llm": {k: v for k, v in os.environ.items() if k.startswith("MOCK_LLM_")},
+    }
+
+
+def compare(new, old, threshold=0.10):
+    """
+    Print p50 changes beyond `threshold` between two result files.
+    """
+    rows = []
+    for name, stats in new.get("micro", {}).items():
+        before = old.get("micro", {}).get(name, {})
+        rows.append((f"micro {name}", before.get("p50_ms"), stats.get("p50_ms")))
+    for mode, levels in new.get("e2e", {}).items():
+        for level, stats in levels.items():
+            before = old.get("e2e", {}).get(mode, {}).get(level, {})
+            rows.append((f"e2e {mode} c={level}", before.get("p50_ms"), stats.get("p50_ms")))
+
+    for label, before, after in rows:
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        flag = "REGRESSION" if change > threshold else ("improved" if change < -threshold else "")
+        print(f"{label:<45} {before:>10.3f} -> {after:>10.3f} ms  {change:+7.1%} {flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma list of concurrency levels")
+    parser.add_argument("--rounds", type=int, default=2, help="batches per concurrency level")
+    parser.add_argument("--iterations", type=int, default=20, help="base iteration count for micro-benchmarks")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--skip-micro", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = {"meta": metadata()}
+    if not args.skip_micro:
+        report["micro"] = micro_benchmarks(args.iterations)
+    if not args.skip_e2e:
+        levels = [int(c) for c in args.concurrency.split(",") if c]
+        modes = [m for m in args.modes.split(",") if m]
+        report["e2e"] = e2e_benchmarks(modes, levels, args.rounds)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
-import io
-from fastapi import FastAPI, BackgroundTasks, Query
+import os
+import asyncio
+
+from fastapi import FastAPI, BackgroundTasks, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import Response, JSONResponse, PlainTextResponse
 
 # --- FIXED: use absolute imports instead of relative ---
-from tools.pdf_tools import markdown_from_paper, generate_pdf_from_text
+from tools.render_cache import MEDIA_TYPES, etag_matches
+from tools.search_index import get_index, close_index
+from tools.serialization import negotiate
+from tools.telemetry import metrics
+from tools.usage import Budget
 from agents.orchestrator import Orchestrator
+from agents import registry
 
 # -------------------------------------------------------
 
@@ -17,79 +24,222 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 orchestrator = Orchestrator()
 
+# Agents and heavy libraries (numpy/sklearn, reportlab, bs4, ...) load on first use.
+# WARM_IMPORTS=all (or e.g. "scout,questions") imports them at startup instead,
+# before the worker takes traffic.
+WARM_IMPORTS = os.getenv("WARM_IMPORTS", "").strip().lower()
+
+
+@app.on_event("startup")
+async def warm_imports():
+    if not WARM_IMPORTS:
+        return
+    names = None if WARM_IMPORTS in ("1", "all", "true") else [n.strip() for n in WARM_IMPORTS.split(",") if n.strip()]
+    await asyncio.get_running_loop().run_in_executor(None, registry.warm, names)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await orchestrator.close()
+    # persist documents still buffered in the local search index
+    close_index()
+
 
 # -----------------------------------------
 # RUN PIPELINE (accept mode query param)
 # -----------------------------------------
 @app.post('/run')
-async def run_research(background_tasks: BackgroundTasks, mode: str = Query("default")):
+async def run_research(
+    background_tasks: BackgroundTasks,
+    mode: str = Query("default"),
+    max_tokens: int = Query(None, ge=1),
+    max_cost_usd: float = Query(None, gt=0),
+    max_seconds: float = Query(None, gt=0),
+    deadline_seconds: float = Query(None, gt=0),
+    force: bool = Query(False),
+):
     """
     Start pipeline. Optional query param `mode`:
       - default
       - explore
       - summarize
       - simulate
-    Example: POST /run?mode=explore
+    Optional budgets: `max_tokens`, `max_cost_usd`, `max_seconds`. Near a limit
+    the run switches to the fallback model and skips the critic; once a limit is
+    reached it stops before the next stage (phase "budget_exceeded").
+    Token/cost usage is reported under `usage` in /status.
+    `deadline_seconds` hard-stops the run (phase "deadline_exceeded") when it expires.
+
+    Identical requests (same mode, budgets and deadline_seconds) are deduplicated:
+    a request with a different deadline never reuses another run. Status is
+    "attached" when an identical run is still in flight and "cached" when one
+    completed recently. Pass `force=true` to always start a new run.
+    Example: POST /run?mode=explore&max_cost_usd=0.01
     """
-    run_id = orchestrator.start(mode=mode)
-    return {"run_id": run_id, "status": "started", "mode": mode}
+    budget = Budget(max_tokens=max_tokens, max_cost_usd=max_cost_usd, max_seconds=max_seconds)
+    run_id, how = orchestrator.submit(mode=mode, budget=budget, deadline=deadline_seconds, force=force)
+    return {"run_id": run_id, "status": how, "mode": mode}
+
+
+# -----------------------------------------
+# CANCEL A RUN
+# -----------------------------------------
+@app.delete('/runs/{run_id}')
+async def cancel_run(run_id: str):
+    """
+    Cancel an active run; in-flight LLM calls are aborted. Checkpoints are
+    kept, so the run can still be resumed later.
+    """
+    await orchestrator.ensure_loaded(run_id)
+    try:
+        cancelled = orchestrator.cancel(run_id)
+    except KeyError:
+        return JSONResponse({"error": "run_id not found"}, status_code=404)
+    if not cancelled:
+        return JSONResponse({"error": "run is not active"}, status_code=409)
+    return JSONResponse({"run_id": run_id, "status": "cancelling"}, status_code=202)
+
+
+# -----------------------------------------
+# RESUME A FAILED / INTERRUPTED / CANCELLED RUN
+# -----------------------------------------
+@app.post('/runs/{run_id}/resume')
+async def resume_run(
+    run_id: str,
+    from_stage: str = Query(None),
+    max_tokens: int = Query(None, ge=1),
+    max_cost_usd: float = Query(None, gt=0),
+    max_seconds: float = Query(None, gt=0),
+    deadline_seconds: float = Query(None, gt=0),
+):
+    """
+    Restart a run from its first stage without a checkpoint.
+    `from_stage` (e.g. critic) reruns that stage and everything after it.
+    Budgets, if given, replace the run's previous budget.
+    """
+    budget = Budget(max_tokens=max_tokens, max_cost_usd=max_cost_usd, max_seconds=max_seconds)
+    await orchestrator.ensure_loaded(run_id)
+    try:
+        orchestrator.resume(run_id, from_stage=from_stage, budget=budget, deadline=deadline_seconds)
+    except KeyError:
+        return JSONResponse({"error": "run_id not found"}, status_code=404)
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return {"run_id": run_id, "status": "resumed", "from_stage": from_stage}
 
 
 # -----------------------------------------
 # CHECK STATUS
 # -----------------------------------------
 @app.get('/status/{run_id}')
-async def status(run_id: str):
-    return orchestrator.get_status(run_id)
+async def status(run_id: str, since: int = Query(None, ge=0), limit: int = Query(None, ge=1)):
+    """
+    Without `since`: full status including every log line.
+    With `since=<seq>`: only log entries after that sequence number, plus
+    phase/progress and `next_seq` to pass on the next poll.
+    """
+    await orchestrator.ensure_loaded(run_id)
+    return orchestrator.get_status(run_id, since=since, limit=limit)
+
+
+@app.get('/status')
+async def bulk_status(run_ids: str = Query(..., description="comma-separated run ids")):
+    """
+    Compact status (phase, percent, current stage, log count) for many runs.
+    """
+    ids = [r for r in run_ids.split(",") if r][:500]
+    await orchestrator.ensure_loaded(*ids)
+    return orchestrator.get_status_many(ids)
 
 
 # -----------------------------------------
 # GET RESULT
 # -----------------------------------------
 @app.get('/result/{run_id}')
-async def result(run_id: str):
-    return orchestrator.get_result(run_id)
+async def result(run_id: str, accept: str = Header(None)):
+    """
+    The run's paper as JSON, or as msgpack when the client sends
+    `Accept: application/msgpack` (and msgpack is installed). Encoded bodies
+    are kept in a bounded cache, so repeated polls skip re-encoding.
+    """
+    media_type = negotiate(accept)
+    await orchestrator.ensure_loaded(run_id)
+    body = orchestrator.get_result_body(run_id, media_type)
+    if body is None:
+        return {}
+    return Response(body, media_type=media_type, headers={"Vary": "Accept"})
+
+
+# -----------------------------------------
+# METRICS (Prometheus text format)
+# -----------------------------------------
+@app.get('/metrics')
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+# -----------------------------------------
+# IMPORT-TIME REPORT
+# -----------------------------------------
+@app.get('/debug/imports')
+def import_report():
+    """
+    Which agents / heavy modules are loaded and how long each took to import.
+    """
+    return registry.import_report()
+
+
+# -----------------------------------------
+# LOCAL FULL-TEXT SEARCH
+# -----------------------------------------
+@app.get('/search')
+def search(q: str, k: int = Query(10, ge=1, le=100)):
+    """
+    BM25 search over the local index of scraped / ingested documents.
+    """
+    return {"query": q, "results": get_index().search(q, k)}
 
 
 # -----------------------------------------
 # DOWNLOAD RESULT (Markdown / PDF)
 # -----------------------------------------
 @app.get('/result/{run_id}/download')
-def download_result(run_id: str, format: str = "md"):
+async def download_result(run_id: str, format: str = "md", if_none_match: str = Header(None)):
     """
     Downloads the generated paper.
     format = 'md' or 'pdf'
+
+    Rendered files are cached per run/format/paper version and carry an ETag;
+    clients sending a matching If-None-Match get a 304 without a re-render.
     """
-    paper = orchestrator.get_result(run_id)
-    if not paper:
+    if format not in MEDIA_TYPES:
+        return JSONResponse({"error": "unsupported format"}, status_code=400)
+
+    # load on the loop, render (CPU-bound) in the threadpool
+    await orchestrator.ensure_loaded(run_id)
+    try:
+        rendered = await asyncio.get_running_loop().run_in_executor(
+            None, orchestrator.get_rendered, run_id, format, if_none_match
+        )
+    except Exception as e:
+        return JSONResponse(
+            {"error": f"{format.upper()} generation failed", "detail": str(e)},
+            status_code=500,
+        )
+    if rendered is None:
         return JSONResponse({"error": "run_id not found"}, status_code=404)
 
-    # Convert to Markdown
-    md = markdown_from_paper(paper)
-
-    # -------- Markdown download --------
-    if format == "md":
-        b = io.BytesIO(md.encode("utf-8"))
-        headers = {"Content-Disposition": f"attachment; filename=paper_{run_id}.md"}
-        return StreamingResponse(b, media_type="text/markdown", headers=headers)
-
-    # -------- PDF download --------
-    elif format == "pdf":
-        try:
-            pdf_bytes = generate_pdf_from_text(md)
-        except Exception as e:
-            return JSONResponse(
-                {"error": "PDF generation failed", "detail": str(e)},
-                status_code=500,
-            )
-        b = io.BytesIO(pdf_bytes)
-        headers = {"Content-Disposition": f"attachment; filename=paper_{run_id}.pdf"}
-        return StreamingResponse(b, media_type="application/pdf", headers=headers)
-
-    # -------- Invalid format --------
-    else:
-        return JSONResponse({"error": "unsupported format"}, status_code=400)
+    body, etag = rendered
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+    if body is None or etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f"attachment; filename=paper_{run_id}.{format}"
+    return Response(body, media_type=MEDIA_TYPES[format], headers=headers)
@@ -1,5 +1,5 @@
 # Simple data schemas and helpers used by agents
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
 class Domain(BaseModel):
@@ -9,10 +9,103 @@ class Domain(BaseModel):
 class Question(BaseModel):
     text: str
 
-class Dataset(BaseModel):
-    rows: List[Dict[str, Any]]
-    meta: Dict[str, Any] = {}
 
-class ExperimentResult(BaseModel):
-    summary: Dict[str, Any]
-    details: Dict[str, Any] = {}
+# Result models are plain __slots__ classes rather than pydantic models: one is
+# kept per stored run, so they avoid a per-instance __dict__ and validation cost.
+# to_dict() gives back the same dict shape the agents produce.
+
+class _Record:
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__ if not k.startswith("_")}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"{type(self).__name__}({fields})"
+
+
+class Dataset(_Record):
+    """
+    Output of the data alchemist (the "data" stage checkpoint).
+    """
+
+    __slots__ = ("rows", "meta")
+
+    def __init__(self, rows: List[Dict[str, Any]], meta: Optional[Dict[str, Any]] = None):
+        self.rows = rows
+        self.meta = meta or {}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Dataset":
+        return cls(rows=data.get("rows", []), meta=data.get("meta"))
+
+
+class ExperimentResult(_Record):
+    """
+    Output of the experiment designer. `summary` is a metrics dict, or a short
+    status string ("not enough data", "error") with the reason in `details`.
+    """
+
+    __slots__ = ("summary", "details", "model_coef", "n_rows")
+
+    def __init__(self, summary: Any, details: Optional[Dict[str, Any]] = None,
+                 model_coef: Optional[List[List[float]]] = None, n_rows: Optional[int] = None):
+        self.summary = summary
+        self.details = details
+        self.model_coef = model_coef
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExperimentResult":
+        extra = {k: v for k, v in data.items() if k not in cls.__slots__}
+        details = data.get("details")
+        if extra:
+            details = {**(details or {}), **extra}
+        return cls(data.get("summary"), details, data.get("model_coef"), data.get("n_rows"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        # omit unset fields so the shape matches what the agent returned
+        return {k: v for k, v in super().to_dict().items() if v is not None}
+
+
+class Paper(_Record):
+    """
+    Final result of a run. Treated as immutable once built; encoded /result
+    bodies are cached by the orchestrator, not on the paper.
+    """
+
+    __slots__ = ("title", "abstract", "results", "critique", "meta")
+
+    def __init__(self, title: str = "Untitled", abstract: str = "", results: Any = None,
+                 critique: Any = None, meta: Optional[Dict[str, Any]] = None):
+        self.title = title
+        self.abstract = abstract
+        self.results = results if results is not None else {}
+        self.critique = critique if critique is not None else {}
+        self.meta = meta
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Paper":
+        results = data.get("results")
+        # experiment output (default/simulate modes) gets its typed model
+        if isinstance(results, dict) and "summary" in results:
+            results = ExperimentResult.from_dict(results)
+        return cls(
+            title=data.get("title", "Untitled"),
+            abstract=data.get("abstract", ""),
+            results=results,
+            critique=data.get("critique"),
+            meta=data.get("meta"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        if isinstance(self.results, _Record):
+            data["results"] = self.results.to_dict()
+        if self.meta is None:
+            del data["meta"]
+        return data
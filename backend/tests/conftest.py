@@ -0,0 +1,13 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# Settings are read at import time, so set them before any backend module loads:
+# offline LLM, no search grounding, and runs kept in memory unless a test opts in.
+os.environ.setdefault("LLM_PROVIDER", "mock")
+os.environ.setdefault("MOCK_LLM_LATENCY", "fixed:0.01")
+os.environ.setdefault("MOCK_LLM_TOKENS_PER_SEC", "0")
+os.environ.setdefault("SEARCH_PROVIDERS", "")
+os.environ.setdefault("RUN_STORE_DIR", "")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
@@ -0,0 +1,90 @@
+# backend/tests/test_budget.py
+import asyncio
+
+from backend.agents.orchestrator import Orchestrator, BudgetExceeded
+from backend.tools import usage
+from backend.tools.run_store import RunStore
+
+
+def _run_with_usage(orch, run_id, max_tokens, used_tokens):
+    orch.store.create(run_id, status=orch.status[run_id])
+    orch.budgets[run_id] = usage.Budget(max_tokens=max_tokens)
+    usage.ledger.open(run_id)["completion_tokens"] = used_tokens
+
+
+def test_soft_limit_switches_to_fallback_model():
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        _run_with_usage(orch, "soft", max_tokens=100, used_tokens=85)
+        seen = []
+
+        async def stage():
+            seen.append(usage.model_override.get())
+            return {"ok": True}
+
+        assert await orch._stage("soft", "default", "questions", stage) == {"ok": True}
+        assert seen == [usage.LLM_FALLBACK_MODEL]
+
+    asyncio.run(main())
+
+
+def test_soft_limit_skips_critic():
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        _run_with_usage(orch, "critic", max_tokens=100, used_tokens=85)
+
+        async def critic(_results):
+            raise AssertionError("critic should be skipped")
+
+        out = await orch._stage("critic", "default", "critic", critic, {})
+        assert out["skipped"] is True
+
+    asyncio.run(main())
+
+
+def test_under_soft_limit_runs_normally():
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        _run_with_usage(orch, "fine", max_tokens=100, used_tokens=10)
+
+        async def critic(_results):
+            return {"critique": "ok", "model": usage.model_override.get()}
+
+        out = await orch._stage("fine", "default", "critic", critic, {})
+        assert out == {"critique": "ok", "model": None}
+
+    asyncio.run(main())
+
+
+def test_exhausted_budget_raises_before_stage():
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        _run_with_usage(orch, "hard", max_tokens=100, used_tokens=100)
+
+        async def stage():
+            raise AssertionError("stage should not run")
+
+        try:
+            await orch._stage("hard", "default", "questions", stage)
+        except BudgetExceeded as e:
+            assert e.used >= 1.0
+        else:
+            raise AssertionError("BudgetExceeded not raised")
+
+    asyncio.run(main())
+
+
+def test_run_stops_with_budget_exceeded_phase():
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        run_id, _ = orch.submit(mode="explore", budget=usage.Budget(max_tokens=1))
+        await asyncio.wait([orch.tasks[run_id]])
+
+        status = orch.get_status(run_id)
+        assert status["phase"] == "budget_exceeded"
+        # the first stage ran and is kept for a resume with a larger budget
+        assert "scout" in orch.store.get(run_id)["checkpoints"]
+        assert "questions" not in orch.store.get(run_id)["checkpoints"]
+        assert orch.get_result(run_id) is None
+
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+# backend/tests/test_cancellation.py
+import asyncio
+import time
+
+from backend.agents.orchestrator import Orchestrator
+from backend.tools.run_store import RunStore
+
+
+def _orchestrator(slots=None):
+    orch = Orchestrator(store=RunStore(""))
+    if slots:
+        orch.run_slots = asyncio.Semaphore(slots)
+    return orch
+
+
+async def _finish(orch, run_id):
+    task = orch.tasks.get(run_id)
+    if task is not None:
+        await asyncio.wait([task])
+    await asyncio.sleep(0)
+    return orch.get_status(run_id)["phase"]
+
+
+async def _wait_for(predicate, timeout=5.0):
+    start = time.monotonic()
+    while not predicate():
+        assert time.monotonic() - start < timeout, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def test_cancel_before_first_step():
+    async def main():
+        orch = _orchestrator()
+        run_id, _ = orch.submit(mode="explore")
+        assert orch.cancel(run_id) is True
+        assert await _finish(orch, run_id) == "cancelled"
+
+        # the run is no longer considered active
+        assert orch.cancel(run_id) is False
+        assert orch.submit(mode="explore")[1] == "started"
+        orch.resume(run_id)
+        assert await _finish(orch, run_id) == "completed"
+
+    asyncio.run(main())
+
+
+def test_cancel_right_after_resume():
+    async def main():
+        orch = _orchestrator()
+        run_id = orch.start(mode="explore")
+        assert await _finish(orch, run_id) == "completed"
+        orch.resume(run_id, from_stage="questions")
+        orch.cancel(run_id)
+        assert await _finish(orch, run_id) == "cancelled"
+
+    asyncio.run(main())
+
+
+def test_cancel_mid_stage_keeps_earlier_checkpoints():
+    async def main():
+        orch = _orchestrator()
+        run_id = orch.start(mode="simulate")
+        # the data stage sleeps ~0.8s before producing its output
+        await _wait_for(lambda: orch.status[run_id].get("stage") == "data")
+        orch.cancel(run_id)
+        assert await _finish(orch, run_id) == "cancelled"
+        assert "data" not in orch.store.get(run_id)["checkpoints"]
+        assert orch.status[run_id]["stage"] is None
+
+    asyncio.run(main())
+
+
+def test_cancel_while_queued():
+    async def main():
+        orch = _orchestrator(slots=1)
+        first = orch.start(mode="simulate")
+        second = orch.start(mode="explore")
+        await _wait_for(lambda: orch.status[second]["phase"] == "queued")
+
+        orch.cancel(second)
+        assert await _finish(orch, second) == "cancelled"
+        assert orch.status[first]["phase"] == "running"
+        assert await _finish(orch, first) == "completed"
+
+        # the slot is free again
+        third = orch.start(mode="explore")
+        assert await _finish(orch, third) == "completed"
+
+    asyncio.run(main())
+
+
+def test_deadline_stops_running_run():
+    async def main():
+        orch = _orchestrator()
+        run_id = orch.start(mode="simulate", deadline=0.2)
+        assert await _finish(orch, run_id) == "deadline_exceeded"
+
+    asyncio.run(main())
+
+
+def test_deadline_counts_time_spent_queued():
+    async def main():
+        orch = _orchestrator(slots=1)
+        blocker = orch.start(mode="simulate")
+        queued = orch.start(mode="explore", deadline=0.2)
+        assert await _finish(orch, queued) == "deadline_exceeded"
+        assert orch.status[blocker]["phase"] == "running"
+        orch.cancel(blocker)
+        await _finish(orch, blocker)
+
+    asyncio.run(main())
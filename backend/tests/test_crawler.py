@@ -0,0 +1,88 @@
+# backend/tests/test_crawler.py
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.agents.orchestrator import Orchestrator
+from backend.tools.crawler import AsyncCrawler
+from backend.tools.run_store import RunStore
+from backend.tools.web_search import SearchClient, StubSearchProvider
+
+BODY = "<html><body><a href='/next'>next</a> crawler test page</body></html>"
+ETAG = '"v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    statuses = []
+
+    def do_GET(self):
+        if self.path == "/robots.txt":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.statuses.append(304)
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.statuses.append(200)
+        data = BODY.encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.statuses = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+
+
+def test_conditional_get_serves_cached_body_on_304(server, tmp_path):
+    url = f"{server}/page"
+
+    async def main():
+        async with AsyncCrawler(cache_dir=str(tmp_path), delay=0) as crawler:
+            first = await crawler.fetch(url)
+        # a fresh crawler (e.g. after a restart) revalidates against the disk cache
+        async with AsyncCrawler(cache_dir=str(tmp_path), delay=0) as crawler:
+            second = await crawler.fetch(url)
+            links = await crawler.fetch_links(url)
+        return first, second, links
+
+    first, second, links = asyncio.run(main())
+    assert first == BODY
+    assert second == BODY
+    assert _Handler.statuses == [200, 304, 304]
+    assert links == [{"text": "next", "href": f"{server}/next"}]
+
+
+def test_fetch_failure_returns_empty_string(tmp_path):
+    async def main():
+        async with AsyncCrawler(cache_dir=str(tmp_path), delay=0, timeout=1) as crawler:
+            return await crawler.fetch("http://127.0.0.1:9/unreachable")
+
+    assert asyncio.run(main()) == ""
+
+
+def test_scouts_share_one_crawler():
+    orch = Orchestrator(store=RunStore(""))
+    assert orch._agent("scout", "r1").crawler is None
+
+    orch.search = SearchClient([StubSearchProvider()])
+    first = orch._agent("scout", "r1").crawler
+    assert first is not None
+    assert orch._agent("scout", "r2").crawler is first
+    asyncio.run(orch.close())
@@ -0,0 +1,103 @@
+# backend/tests/test_dedup.py
+import asyncio
+
+from backend.agents import orchestrator as orchestrator_module
+from backend.agents.orchestrator import Orchestrator, spec_fingerprint
+from backend.tools.run_store import RunStore
+from backend.tools.usage import Budget
+
+
+async def _finish(orch, run_id):
+    task = orch.tasks.get(run_id)
+    if task is not None:
+        await asyncio.wait([task])
+    await asyncio.sleep(0)
+
+
+def test_fingerprint_depends_on_mode_and_budget():
+    assert spec_fingerprint("explore") == spec_fingerprint("explore", None)
+    assert spec_fingerprint("explore") != spec_fingerprint("default")
+    assert spec_fingerprint("explore", Budget(max_tokens=10)) != spec_fingerprint("explore", Budget(max_tokens=20))
+    assert spec_fingerprint("explore", None, 30) == spec_fingerprint("explore", None, 30.0)
+    assert spec_fingerprint("explore", None, 30) != spec_fingerprint("explore", None, 60)
+    assert spec_fingerprint("explore", None, 30) != spec_fingerprint("explore")
+
+
+def test_different_deadline_is_not_attached():
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        run_id, _ = orch.submit(mode="explore", deadline=60)
+        assert orch.submit(mode="explore", deadline=60) == (run_id, "attached")
+
+        other, how = orch.submit(mode="explore", deadline=0.001)
+        assert how == "started" and other != run_id
+        assert orch.get_status(other)["deadline_seconds"] == 0.001
+        await _finish(orch, run_id)
+        await _finish(orch, other)
+
+    asyncio.run(main())
+
+
+def test_attached_cached_and_force():
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        run_id, how = orch.submit(mode="explore")
+        assert how == "started"
+        assert orch.submit(mode="explore") == (run_id, "attached")
+        # a different spec is a different run
+        assert orch.submit(mode="explore", budget=Budget(max_tokens=10_000))[1] == "started"
+
+        await _finish(orch, run_id)
+        assert orch.submit(mode="explore") == (run_id, "cached")
+
+        forced, how = orch.submit(mode="explore", force=True)
+        assert how == "started" and forced != run_id
+        # the forced run is now the latest for this spec
+        assert orch.submit(mode="explore") == (forced, "attached")
+        await _finish(orch, forced)
+
+    asyncio.run(main())
+
+
+def test_failed_or_cancelled_runs_are_not_reused():
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        run_id, _ = orch.submit(mode="explore")
+        orch.cancel(run_id)
+        await _finish(orch, run_id)
+        new_id, how = orch.submit(mode="explore")
+        assert how == "started" and new_id != run_id
+        await _finish(orch, new_id)
+
+    asyncio.run(main())
+
+
+def test_cached_result_expires_after_ttl(monkeypatch):
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        run_id, _ = orch.submit(mode="explore")
+        await _finish(orch, run_id)
+        assert orch.submit(mode="explore")[1] == "cached"
+
+        orch.status[run_id]["completed_at"] -= 61
+        monkeypatch.setattr(orchestrator_module, "RUN_DEDUP_TTL", 60)
+        new_id, how = orch.submit(mode="explore")
+        assert how == "started" and new_id != run_id
+        await _finish(orch, new_id)
+
+    asyncio.run(main())
+
+
+def test_cached_after_restart(tmp_path):
+    async def first_worker():
+        orch = Orchestrator(store=RunStore(str(tmp_path)))
+        run_id, _ = orch.submit(mode="explore")
+        await _finish(orch, run_id)
+        # let the final snapshot write (run in an executor) land
+        await asyncio.sleep(0.1)
+        return run_id
+
+    run_id = asyncio.run(first_worker())
+    orch = Orchestrator(store=RunStore(str(tmp_path)))
+    assert orch.fingerprints[spec_fingerprint("explore")] == run_id
+    assert orch.get_status(run_id)["phase"] == "completed"
@@ -0,0 +1,96 @@
+# backend/tests/test_render_cache.py
+import json
+
+import pytest
+
+from backend.agents.orchestrator import Orchestrator
+from backend.models.schemas import Paper
+from backend.tools.render_cache import RenderCache, ResultCache, etag_matches
+from backend.tools.run_store import RunStore
+
+PAPER = {"title": "T", "abstract": "A", "results": {"summary": {"accuracy": 0.5}}, "critique": {}}
+
+
+def _orchestrator(paper=PAPER, version=1):
+    orch = Orchestrator(store=RunStore(""))
+    orch.runs["r1"] = Paper.from_dict(paper)
+    orch.versions["r1"] = version
+    return orch
+
+
+def _count_renders(monkeypatch):
+    calls = []
+    original = RenderCache._render
+
+    def counting(self, paper, fmt):
+        calls.append(fmt)
+        return original(self, paper, fmt)
+
+    monkeypatch.setattr(RenderCache, "_render", counting)
+    return calls
+
+
+def test_etag_stable_across_eviction_and_new_orchestrator():
+    orch = _orchestrator()
+    for fmt in ("md", "pdf"):
+        body, etag = orch.get_rendered("r1", fmt)
+        orch.renders.invalidate("r1")
+        assert orch.get_rendered("r1", fmt)[1] == etag
+        assert _orchestrator().get_rendered("r1", fmt) == (body, etag)
+
+
+def test_matching_if_none_match_skips_rendering(monkeypatch):
+    orch = _orchestrator()
+    _, etag = orch.get_rendered("r1", "pdf")
+    orch.renders.invalidate("r1")
+    calls = _count_renders(monkeypatch)
+
+    assert orch.get_rendered("r1", "pdf", if_none_match=etag) == (None, etag)
+    assert calls == []
+    body, _ = orch.get_rendered("r1", "pdf", if_none_match='"other"')
+    assert body and calls == ["pdf"]
+
+
+def test_weak_and_list_if_none_match():
+    etag = '"abc"'
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"x", W/"abc" , "y"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"abcd"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_new_paper_version_changes_etag():
+    orch = _orchestrator()
+    _, old = orch.get_rendered("r1", "md")
+    orch.runs["r1"] = Paper.from_dict({**PAPER, "abstract": "Revised"})
+    orch.versions["r1"] = 2
+    _, new = orch.get_rendered("r1", "md")
+    assert new != old
+    assert orch.get_rendered("r1", "pdf")[1] != new
+
+
+def test_result_body_json_and_msgpack_cached_per_version():
+    msgpack = pytest.importorskip("msgpack")
+    orch = _orchestrator()
+
+    body = orch.get_result_body("r1", "application/json")
+    assert json.loads(body) == Paper.from_dict(PAPER).to_dict()
+    packed = orch.get_result_body("r1", "application/msgpack")
+    assert msgpack.unpackb(packed, raw=False) == Paper.from_dict(PAPER).to_dict()
+    assert orch.get_result_body("r1", "application/msgpack") is packed
+
+    # a new paper version is encoded afresh
+    orch.runs["r1"] = Paper.from_dict({**PAPER, "title": "T2"})
+    orch.versions["r1"] = 2
+    assert msgpack.unpackb(orch.get_result_body("r1", "application/msgpack"), raw=False)["title"] == "T2"
+    assert orch.get_result_body("unknown", "application/json") is None
+
+
+def test_result_cache_is_bounded():
+    cache = ResultCache(max_entries=2)
+    paper = Paper.from_dict(PAPER)
+    for run_id in ("a", "b", "c"):
+        cache.get(run_id, "application/json", 1, paper)
+    assert cache.peek("a", "application/json", 1) is None
+    assert cache.peek("c", "application/json", 1) is not None
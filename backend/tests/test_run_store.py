@@ -0,0 +1,166 @@
+# backend/tests/test_run_store.py
+import asyncio
+import os
+import time
+import threading
+
+from backend.agents.orchestrator import Orchestrator
+from backend.models.schemas import Dataset
+from backend.tools.run_store import RunStore
+from backend.tools.serialization import dumps
+
+SCOUT_OUTPUT = [{"name": "Checkpointed domain", "confidence": 0.5}]
+
+
+async def _finish(orch, run_id):
+    task = orch.tasks.get(run_id)
+    if task is not None:
+        await asyncio.wait([task])
+    return orch.get_status(run_id)
+
+
+def _write_interrupted_run(root, run_id="r1"):
+    record = {
+        "run_id": run_id,
+        "checkpoints": {"scout": SCOUT_OUTPUT},
+        "paper": None,
+        "status": {"phase": "running", "mode": "explore", "logs": ["Starting pipeline"], "created_at": time.time()},
+    }
+    with open(os.path.join(root, f"{run_id}.json"), "wb") as f:
+        f.write(dumps(record))
+    return run_id
+
+
+def test_restart_marks_active_run_interrupted(tmp_path):
+    run_id = _write_interrupted_run(str(tmp_path))
+    orch = Orchestrator(store=RunStore(str(tmp_path)))
+    assert orch.get_status(run_id)["phase"] == "interrupted"
+
+
+def test_resume_runs_from_first_missing_stage(tmp_path):
+    run_id = _write_interrupted_run(str(tmp_path))
+
+    async def main():
+        orch = Orchestrator(store=RunStore(str(tmp_path)))
+        orch.resume(run_id)
+        status = await _finish(orch, run_id)
+        assert status["phase"] == "completed"
+        assert "Reusing checkpoint: scout" in status["logs"]
+        # the reused scout output flows into the paper unchanged
+        assert orch.get_result(run_id).results["domains"] == SCOUT_OUTPUT
+        assert set(orch.store.get(run_id)["checkpoints"]) == {"scout", "questions"}
+
+    asyncio.run(main())
+
+    # and the completed run survives another restart
+    orch = Orchestrator(store=RunStore(str(tmp_path)))
+    assert orch.get_status(run_id)["phase"] == "completed"
+    assert orch.get_result(run_id).results["domains"] == SCOUT_OUTPUT
+
+
+def test_resume_from_stage_reruns_that_stage_and_later(tmp_path):
+    async def main():
+        orch = Orchestrator(store=RunStore(str(tmp_path)))
+        run_id = orch.start(mode="explore")
+        await _finish(orch, run_id)
+        first_questions = orch.store.get(run_id)["checkpoints"]["questions"]
+
+        orch.store.get(run_id)["checkpoints"]["questions"] = ["stale"]
+        orch.resume(run_id, from_stage="questions")
+        status = await _finish(orch, run_id)
+
+        logs = status["logs"]
+        assert status["phase"] == "completed"
+        assert logs.count("Reusing checkpoint: scout") == 1
+        assert "Reusing checkpoint: questions" not in logs
+        assert orch.store.get(run_id)["checkpoints"]["questions"] == first_questions
+
+    asyncio.run(main())
+
+
+def test_resume_rejects_unknown_stage_and_run(tmp_path):
+    run_id = _write_interrupted_run(str(tmp_path), "r2")
+    orch = Orchestrator(store=RunStore(str(tmp_path)))
+    try:
+        orch.resume("missing")
+        assert False, "expected KeyError"
+    except KeyError:
+        pass
+    try:
+        orch.resume(run_id, from_stage="critic")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_records_beyond_preload_load_on_access(tmp_path):
+    for n in range(3):
+        _write_interrupted_run(str(tmp_path), f"r{n}")
+        os.utime(tmp_path / f"r{n}.json", (time.time() - 100 + n, time.time() - 100 + n))
+
+    orch = Orchestrator(store=RunStore(str(tmp_path), preload=1))
+    assert set(orch.status) == {"r2"}
+    assert orch.get_status("r0")["phase"] == "interrupted"
+    assert orch.get_status_many(["r1", "nope"])["r1"]["phase"] == "interrupted"
+
+
+def test_ensure_loaded_reads_off_loop_and_restores_on_loop(tmp_path, monkeypatch):
+    for n in range(2):
+        _write_interrupted_run(str(tmp_path), f"r{n}")
+        os.utime(tmp_path / f"r{n}.json", (time.time() - 100 + n, time.time() - 100 + n))
+    store = RunStore(str(tmp_path), preload=1)
+    orch = Orchestrator(store=store)
+    assert set(orch.status) == {"r1"}
+
+    loop_thread = threading.get_ident()
+    reads, restores = [], []
+    load, restore = store.load, orch._restore_record
+    monkeypatch.setattr(store, "load", lambda run_id: reads.append(threading.get_ident()) or load(run_id))
+    monkeypatch.setattr(orch, "_restore_record",
+                        lambda *a: restores.append(threading.get_ident()) or restore(*a))
+
+    async def main():
+        await orch.ensure_loaded("r0", "r1", "nope")
+        assert orch.get_status("r0")["phase"] == "interrupted"
+
+    asyncio.run(main())
+    # only the run that was not in memory is read, in a worker thread
+    assert len(reads) == 1 and reads[0] != loop_thread
+    assert restores == [loop_thread]
+
+
+def test_retention_prunes_old_and_excess_records(tmp_path):
+    now = time.time()
+    for n, age in enumerate((10, 20, 30, 10_000)):
+        _write_interrupted_run(str(tmp_path), f"r{n}")
+        os.utime(tmp_path / f"r{n}.json", (now - age, now - age))
+
+    store = RunStore(str(tmp_path), ttl=1000, max_records=2)
+    orch = Orchestrator(store=store)
+    assert sorted(store.touched) == ["r0", "r1"]
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == ["r0.json", "r1.json"]
+    assert orch.get_status("r3")["phase"] == "unknown"
+
+
+def test_data_checkpoint_is_typed_and_survives_restart(tmp_path):
+    async def first_worker():
+        orch = Orchestrator(store=RunStore(str(tmp_path)))
+        run_id = orch.start(mode="simulate")
+        await _finish(orch, run_id)
+        dataset = orch.store.get(run_id)["checkpoints"]["data"]
+        assert isinstance(dataset, Dataset) and dataset.rows
+        await asyncio.sleep(0.1)
+        return run_id, dataset
+
+    run_id, dataset = asyncio.run(first_worker())
+
+    async def second_worker():
+        orch = Orchestrator(store=RunStore(str(tmp_path)))
+        assert orch.store.get(run_id)["checkpoints"]["data"] == dataset
+        orch.resume(run_id, from_stage="experiment")
+        status = await _finish(orch, run_id)
+        assert status["phase"] == "completed"
+        assert "Reusing checkpoint: data" in status["logs"]
+        assert orch.get_result(run_id).results.n_rows == len(dataset.rows)
+
+    asyncio.run(second_worker())
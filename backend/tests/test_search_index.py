@@ -0,0 +1,90 @@
+# backend/tests/test_search_index.py
+import time
+
+from backend.tools.search_index import SearchIndex
+
+
+def _ids(results):
+    return [r["doc_id"] for r in results]
+
+
+def test_bm25_ranks_more_relevant_doc_first(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.add_document("a", "graph neural networks for drug discovery")
+    index.add_document("b", "graph graph graph neural networks")
+    index.add_document("c", "climate downscaling with diffusion models")
+    assert _ids(index.search("graph", k=3)) == ["b", "a"]
+    assert index.search("protein") == []
+
+
+def test_reopen_after_add_without_explicit_flush(tmp_path):
+    index = SearchIndex(str(tmp_path), flush_interval=0.05)
+    index.add_document("a", "federated learning on edge robots", url="https://x/a")
+    time.sleep(0.3)
+
+    reopened = SearchIndex(str(tmp_path))
+    assert len(reopened) == 1
+    assert _ids(reopened.search("federated")) == ["a"]
+
+
+def test_reopen_after_close(tmp_path):
+    index = SearchIndex(str(tmp_path), flush_interval=0)
+    index.add_document("a", "federated learning on edge robots")
+    index.close()
+
+    assert _ids(SearchIndex(str(tmp_path)).search("robots")) == ["a"]
+
+
+def test_flush_every_threshold_writes_segment(tmp_path):
+    index = SearchIndex(str(tmp_path), flush_every=2, flush_interval=0)
+    index.add_document("a", "alpha")
+    index.add_document("b", "beta")
+    assert len(SearchIndex(str(tmp_path))) == 2
+
+
+def test_readd_and_delete_then_compact_and_reopen(tmp_path):
+    index = SearchIndex(str(tmp_path), flush_every=1, flush_interval=0)
+    index.add_document("a", "old text about quantum chemistry")
+    index.add_document("b", "quantum error correction")
+    index.add_document("a", "new text about protein folding")
+    index.delete_document("b")
+    index.compact()
+
+    assert index.search("quantum") == []
+    assert _ids(index.search("protein")) == ["a"]
+    index.close()
+
+    reopened = SearchIndex(str(tmp_path))
+    assert len(reopened) == 1
+    assert reopened.search("quantum") == []
+    assert _ids(reopened.search("protein")) == ["a"]
+    assert len(list(tmp_path.glob("*.post"))) == 1
+
+
+def test_readd_with_unchanged_text_is_a_noop(tmp_path):
+    index = SearchIndex(str(tmp_path), flush_interval=0)
+    first = index.add_document("a", "sparse attention kernels", url="https://x/a")
+    assert index.add_document("a", "sparse attention kernels", url="https://x/a") == first
+    assert index.add_document("a", "dense attention kernels", url="https://x/a") != first
+    assert _ids(index.search("dense")) == ["a"]
+    assert index.search("sparse") == []
+
+
+def test_merge_policy_bounds_segments_and_drops_tombstones(tmp_path):
+    index = SearchIndex(str(tmp_path), flush_every=1, flush_interval=0, max_segments=3)
+    for n in range(10):
+        index.add_document(f"d{n}", f"document number{n} about reinforcement learning")
+    assert len(list(tmp_path.glob("*.post"))) <= 3
+
+    for n in range(5):
+        index.delete_document(f"d{n}")
+    index.flush()
+    assert len(index._docs) == 5
+    assert not any(d.get("deleted") for d in index._docs)
+    assert len(list(tmp_path.glob("docs*.json"))) == 1
+    index.close()
+
+    reopened = SearchIndex(str(tmp_path))
+    assert len(reopened) == 5
+    assert sorted(_ids(reopened.search("reinforcement", k=10))) == [f"d{n}" for n in range(5, 10)]
+    assert _ids(reopened.search("number7")) == ["d7"]
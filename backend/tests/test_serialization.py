@@ -0,0 +1,28 @@
+# backend/tests/test_serialization.py
+import pytest
+
+from backend.tools.serialization import negotiate, JSON_MEDIA_TYPE
+
+pytest.importorskip("msgpack")
+
+MSGPACK = "application/msgpack"
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON_MEDIA_TYPE),
+    ("", JSON_MEDIA_TYPE),
+    ("application/json", JSON_MEDIA_TYPE),
+    ("*/*", JSON_MEDIA_TYPE),
+    ("application/msgpack", MSGPACK),
+    ("application/x-msgpack", MSGPACK),
+    ("application/json, application/msgpack", MSGPACK),
+    ("application/msgpack;q=0.5, application/json", JSON_MEDIA_TYPE),
+    ("application/json;q=0.5, application/msgpack", MSGPACK),
+    ("application/json;q=0.8, application/msgpack;q=0.8", MSGPACK),
+    ("application/msgpack;q=0", JSON_MEDIA_TYPE),
+    ("application/msgpack;q=bogus", JSON_MEDIA_TYPE),
+    ("APPLICATION/MSGPACK ; q=0.9, */*;q=0.1", MSGPACK),
+    ("text/html", JSON_MEDIA_TYPE),
+])
+def test_negotiate_q_values(accept, expected):
+    assert negotiate(accept) == expected
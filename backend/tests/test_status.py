@@ -0,0 +1,71 @@
+# backend/tests/test_status.py
+import asyncio
+
+from backend.agents.orchestrator import Orchestrator
+from backend.tools.run_store import RunStore
+
+
+def _completed_run():
+    async def main():
+        orch = Orchestrator(store=RunStore(""))
+        run_id, _ = orch.submit(mode="explore")
+        await asyncio.wait([orch.tasks[run_id]])
+        return orch, run_id
+
+    return asyncio.run(main())
+
+
+def test_incremental_logs_with_since_and_limit():
+    orch, run_id = _completed_run()
+    logs = orch.get_status(run_id)["logs"]
+    assert len(logs) > 3
+
+    page = orch.get_status(run_id, since=0, limit=2)
+    assert [e["seq"] for e in page["logs"]] == [1, 2]
+    assert [e["message"] for e in page["logs"]] == logs[:2]
+    assert page["next_seq"] == 2
+
+    rest = orch.get_status(run_id, since=page["next_seq"])
+    assert [e["message"] for e in rest["logs"]] == logs[2:]
+    assert rest["next_seq"] == len(logs)
+    assert rest["phase"] == "completed" and rest["progress"]["percent"] == 100
+
+
+def test_since_past_end_returns_no_logs():
+    orch, run_id = _completed_run()
+    n = len(orch.get_status(run_id)["logs"])
+    page = orch.get_status(run_id, since=n + 10)
+    assert page["logs"] == []
+    assert page["next_seq"] == n
+
+
+def test_unknown_run():
+    orch = Orchestrator(store=RunStore(""))
+    assert orch.get_status("nope") == {"phase": "unknown", "logs": []}
+    assert orch.get_status("nope", since=0) == {"run_id": "nope", "phase": "unknown", "logs": [], "next_seq": 0}
+
+
+def test_progress_is_per_stage_done_or_not():
+    orch = Orchestrator(store=RunStore(""))
+    orch.status["r1"] = {"phase": "running", "mode": "explore", "logs": [], "stage": "questions"}
+    orch.store.create("r1", status=orch.status["r1"])["checkpoints"]["scout"] = []
+
+    progress = orch.get_status("r1")["progress"]
+    assert progress["percent"] == 50
+    assert progress["stages"] == [
+        {"name": "scout", "state": "done", "percent": 100},
+        {"name": "questions", "state": "running", "percent": 0},
+    ]
+
+
+def test_bulk_status():
+    orch, run_id = _completed_run()
+    out = orch.get_status_many([run_id, "nope"])
+    assert out["nope"] == {"phase": "unknown"}
+    assert out[run_id] == {
+        "phase": "completed",
+        "mode": "explore",
+        "percent": 100,
+        "stage": None,
+        "log_count": len(orch.get_status(run_id)["logs"]),
+    }
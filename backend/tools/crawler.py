@@ -0,0 +1,225 @@
+# backend/tools/crawler.py
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from . import telemetry
+from .scraper import USER_AGENT, parse_links
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.getenv("SCRAPER_CACHE_DIR", os.path.join(".cache", "scraper"))
+
+
+class DiskCache:
+    """
+    Tiny on-disk HTTP cache: one .json (validators) + one .body file per URL.
+    Only stores what's needed for conditional GETs (ETag / Last-Modified).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.root, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "r", encoding="utf-8") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def store(self, url, meta, body):
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        # write body first, then meta: a meta file always points at a complete body
+        for path, data in ((body_path, body), (meta_path, json.dumps(meta))):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+
+class _HostState:
+    def __init__(self, per_host: int):
+        self.sem = asyncio.Semaphore(per_host)
+        self.lock = asyncio.Lock()
+        self.next_allowed = 0.0
+        self.robots = None
+        self.crawl_delay = None
+
+
+class AsyncCrawler:
+    """
+    Async crawler on a pooled httpx client.
+
+    - at most `per_host` concurrent requests per host and `delay` seconds between
+      request starts to the same host (or the robots.txt Crawl-delay if larger)
+    - robots.txt is fetched once per host and honoured when `respect_robots` is set
+    - conditional GETs (If-None-Match / If-Modified-Since) against the disk cache;
+      a 304 serves the cached body
+
+    Like fetch_simple, fetch() never raises and returns "" on failure.
+
+    Usage:
+        async with AsyncCrawler() as crawler:
+            pages = await crawler.fetch_many(urls)
+    """
+
+    def __init__(
+        self,
+        cache_dir=DEFAULT_CACHE_DIR,
+        max_connections: int = 20,
+        per_host: int = 2,
+        delay: float = 1.0,
+        timeout: float = 10.0,
+        respect_robots: bool = True,
+    ):
+        self.cache = DiskCache(cache_dir) if cache_dir else None
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.delay = delay
+        self.timeout = timeout
+        self.respect_robots = respect_robots
+        self._client = None
+        self._hosts = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT},
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host(self, url):
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        if key not in self._hosts:
+            self._hosts[key] = _HostState(self.per_host)
+        return key, self._hosts[key]
+
+    async def _load_robots(self, origin, state):
+        async with state.lock:
+            if state.robots is not None:
+                return
+            parser = RobotFileParser()
+            try:
+                r = await self.client.get(f"{origin}/robots.txt")
+                if r.status_code in (401, 403):
+                    parser.disallow_all = True
+                elif r.status_code == 200:
+                    parser.parse(r.text.splitlines())
+                else:
+                    parser.allow_all = True
+            except Exception as e:
+                logger.info("robots.txt unavailable for %s: %s", origin, e)
+                parser.allow_all = True
+            state.robots = parser
+            state.crawl_delay = parser.crawl_delay(USER_AGENT)
+
+    async def _wait_politely(self, state):
+        delay = max(self.delay, float(state.crawl_delay or 0))
+        async with state.lock:
+            now = time.monotonic()
+            wait = state.next_allowed - now
+            state.next_allowed = max(now, state.next_allowed) + delay
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def fetch(self, url: str) -> str:
+        origin, state = self._host(url)
+        loop = asyncio.get_running_loop()
+        try:
+            if self.respect_robots:
+                await self._load_robots(origin, state)
+                if not state.robots.can_fetch(USER_AGENT, url):
+                    logger.info("robots.txt disallows %s", url)
+                    return ""
+
+            cached = None
+            headers = {}
+            if self.cache is not None:
+                cached = await loop.run_in_executor(None, self.cache.load, url)
+                if cached:
+                    meta = cached[0]
+                    if meta.get("etag"):
+                        headers["If-None-Match"] = meta["etag"]
+                    if meta.get("last_modified"):
+                        headers["If-Modified-Since"] = meta["last_modified"]
+
+            async with state.sem:
+                await self._wait_politely(state)
+                r = await self.client.get(url, headers=headers)
+
+            if self.cache is not None:
+                telemetry.cache_lookup("http", r.status_code == 304 and bool(cached))
+            if r.status_code == 304 and cached:
+                return cached[1]
+            r.raise_for_status()
+            body = r.text
+
+            if self.cache is not None:
+                meta = {
+                    "url": url,
+                    "etag": r.headers.get("ETag"),
+                    "last_modified": r.headers.get("Last-Modified"),
+                    "fetched_at": time.time(),
+                }
+                await loop.run_in_executor(None, self.cache.store, url, meta, body)
+            return body
+        except Exception as e:
+            logger.warning("AsyncCrawler.fetch failed for %s: %s", url, e)
+            return ""
+
+    async def fetch_many(self, urls) -> dict:
+        """
+        Fetch many URLs concurrently (subject to the per-host limits).
+        Returns {url: text}; failed fetches map to "".
+        """
+        urls = list(dict.fromkeys(urls))
+        pages = await asyncio.gather(*(self.fetch(u) for u in urls))
+        return dict(zip(urls, pages))
+
+    async def fetch_links(self, url: str):
+        """
+        Fetch a page and return its links resolved against the page URL.
+        Parsing runs in the default executor to keep the loop responsive.
+        """
+        html = await self.fetch(url)
+        if not html:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, parse_links, html, url)
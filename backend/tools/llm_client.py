@@ -1,11 +1,74 @@
 # backend/tools/llm_client.py
 import os
+import time
 import asyncio
 import json
-import requests
+import logging
+import weakref
+
+import httpx
+
+from . import telemetry
+from .usage import ledger, estimate_cost, current_agent, model_override
+
+logger = logging.getLogger(__name__)
 
 # Read OpenRouter key from env var
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+
+# "openrouter" (default) or "mock" for the offline stand-in in tools/mock_llm.py
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openrouter").strip().lower()
+
+# Retries for transient failures (429 / 5xx / network errors); 0 keeps single-shot behaviour
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "0"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Max in-flight LLM calls per event loop; calls beyond this wait (llm_queue_wait_seconds)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+
+# httpx clients and semaphores are bound to an event loop, so keep one set per loop
+_loop_state = weakref.WeakKeyDictionary()
+
+
+def _state():
+    loop = asyncio.get_running_loop()
+    state = _loop_state.get(loop)
+    if state is None:
+        client = httpx.AsyncClient(
+            timeout=20,
+            limits=httpx.Limits(max_connections=LLM_MAX_CONCURRENCY, max_keepalive_connections=LLM_MAX_CONCURRENCY),
+        )
+        state = _loop_state[loop] = (client, asyncio.Semaphore(LLM_MAX_CONCURRENCY))
+    return state
+
+
+async def _send(payload, span):
+    """
+    One round trip. Returns (status_code, raw_text); raises on transport errors.
+    Fully async, so cancelling the calling task aborts the request and frees its slot.
+    """
+    client, slots = _state()
+    submitted = time.perf_counter()
+    async with slots:
+        waited = time.perf_counter() - submitted
+        telemetry.metrics.observe("llm_queue_wait_seconds", waited, model=payload["model"])
+        span.attrs["queue_wait"] = span.attrs.get("queue_wait", 0.0) + waited
+
+        if LLM_PROVIDER == "mock":
+            from .mock_llm import get_mock_llm
+            return await get_mock_llm().complete(payload)
+
+        resp = await client.post(
+            f"{OPENROUTER_BASE_URL}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            json=payload,
+        )
+        return resp.status_code, resp.text
+
 
 async def generate(
     prompt: str,
@@ -14,18 +77,18 @@ async def generate(
     temperature: float = 0.2,
 ) -> str:
     """
-    Simple OpenRouter HTTP client using requests run in a threadpool.
+    Simple OpenRouter HTTP client on a pooled httpx.AsyncClient.
+    With LLM_PROVIDER=mock the request is answered by tools.mock_llm instead.
+    Each call is recorded as an `llm_request` telemetry span and its token
+    usage/cost is added to the current run's ledger entry. If the orchestrator
+    has set a model override (budget nearly used), it replaces `model`.
     Returns the assistant text (string) or "" on error.
     """
-    if not OPENROUTER_API_KEY:
-        print("❌ ERROR: OPENROUTER_API_KEY not set")
-        return ""
+    model = model_override.get() or model
 
-    url = "https://openrouter.ai/api/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
-    }
+    if LLM_PROVIDER != "mock" and not OPENROUTER_API_KEY:
+        logger.error("OPENROUTER_API_KEY not set")
+        return ""
 
     payload = {
         "model": model,
@@ -34,51 +97,55 @@ async def generate(
         "temperature": temperature,
     }
 
-    # NOTE: this must be a regular function (not async) so run_in_executor executes it
-    def _call():
-        try:
-            return requests.post(url, headers=headers, json=payload, timeout=20)
-        except Exception as e:
-            return e
+    with telemetry.span("llm_request", labels={"model": model}) as span:
+        attempt = 0
+        while True:
+            try:
+                status, raw_text = await _send(payload, span)
+            except Exception as e:
+                status, raw_text = None, repr(e)
 
-    resp = await asyncio.get_event_loop().run_in_executor(None, _call)
+            if (status is None or status in RETRY_STATUSES) and attempt < LLM_MAX_RETRIES:
+                attempt += 1
+                telemetry.metrics.inc("llm_retries_total", model=model)
+                logger.info("LLM call failed (status=%s), retry %d/%d", status, attempt, LLM_MAX_RETRIES)
+                await asyncio.sleep(min(8.0, 0.5 * 2 ** (attempt - 1)))
+                continue
+            break
 
-    # If exception occurred inside _call, resp will be an Exception instance
-    if isinstance(resp, Exception):
-        print("\n=== OPENROUTER REQUEST ERROR ===")
-        print(resp)
-        print("================================\n")
-        return ""
+        span.set(retries=attempt)
+        span.labels["status"] = str(status) if status is not None else "error"
 
-    # Ensure we have a requests.Response
-    try:
-        status = resp.status_code
-        raw_text = resp.text
-    except Exception as e:
-        print("\n=== OPENROUTER RESPONSE INVALID ===")
-        print("repr(resp):", repr(resp)[:1000])
-        print("error:", e)
-        print("==================================\n")
-        return ""
+        if status is None:
+            logger.error("OpenRouter request error: %s", raw_text)
+            return ""
 
-    # Debug: print beginning of response body
-    print("\n===== RAW OPENROUTER RESPONSE (truncated) =====")
-    print(raw_text[:2000])
-    print("==============================================\n")
+        logger.debug("Raw OpenRouter response (truncated): %s", raw_text[:2000])
 
-    if status != 200:
-        print("\n=== OPENROUTER HTTP ERROR ===")
-        print("Status:", status)
-        print(raw_text)
-        print("================================\n")
-        return ""
+        if status != 200:
+            logger.error("OpenRouter HTTP error %s: %s", status, raw_text[:2000])
+            return ""
 
-    # Parse JSON safely
-    try:
-        data = resp.json()
-    except Exception as e:
-        print("❌ Failed to parse JSON from OpenRouter:", e)
-        return ""
+        # Parse JSON safely
+        try:
+            data = json.loads(raw_text)
+        except Exception as e:
+            logger.error("Failed to parse JSON from OpenRouter: %s", e)
+            return ""
+
+        usage = data.get("usage") if isinstance(data, dict) else None
+        if isinstance(usage, dict):
+            agent = current_agent.get()
+            prompt_tokens = int(usage.get("prompt_tokens") or 0)
+            completion_tokens = int(usage.get("completion_tokens") or 0)
+            # prefer the provider-reported cost when present
+            cost = usage.get("cost")
+            cost = float(cost) if cost is not None else estimate_cost(model, prompt_tokens, completion_tokens)
+            span.set(tokens_in=prompt_tokens, tokens_out=completion_tokens, cost_usd=cost)
+            telemetry.metrics.inc("llm_tokens_total", prompt_tokens, model=model, agent=agent, direction="prompt")
+            telemetry.metrics.inc("llm_tokens_total", completion_tokens, model=model, agent=agent, direction="completion")
+            telemetry.metrics.inc("llm_cost_usd_total", cost, model=model, agent=agent)
+            ledger.record(telemetry.current_run.get(), agent, model, prompt_tokens, completion_tokens, cost)
 
     # Extract assistant content
     try:
@@ -95,8 +162,7 @@ async def generate(
             content = None
 
     if content is None:
-        print("❌ OpenRouter response did not contain assistant content. Full response:")
-        print(json.dumps(data)[:3000])
+        logger.error("OpenRouter response did not contain assistant content: %s", json.dumps(data)[:3000])
         return ""
 
     if not isinstance(content, str):
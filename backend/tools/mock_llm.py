@@ -0,0 +1,214 @@
+# backend/tools/mock_llm.py
+"""
+Deterministic offline stand-in for the OpenRouter chat completions API.
+
+Two ways to use it:
+  - in-process: LLM_PROVIDER=mock makes llm_client.generate() call MockLLM directly
+  - as a server: python -m backend.tools.mock_llm --port 8001, then point the real
+    client at it with OPENROUTER_BASE_URL=http://localhost:8001/api/v1
+
+Configuration (env):
+  MOCK_LLM_LATENCY          fixed:S | uniform:LO:HI | lognormal:MEDIAN:SIGMA | exp:MEAN
+                            time to first token in seconds (default: lognormal:0.3:0.5)
+  MOCK_LLM_TOKENS_PER_SEC   completion throughput (default: 50, 0 = instant)
+  MOCK_LLM_ERROR_RATE       fraction of calls answered with HTTP 500 (default: 0)
+  MOCK_LLM_RATE_LIMIT_RATE  fraction of calls answered with HTTP 429 (default: 0)
+  MOCK_LLM_MALFORMED_RATE   fraction of calls returning unparseable JSON (default: 0)
+  MOCK_LLM_SEED             seed; same seed + same call sequence = same outputs
+"""
+import os
+import json
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Canned, valid answers per agent prompt (matched by a marker phrase in the prompt)
+CANNED = {
+    "scout": {"domains": [
+        {"name": "Federated foundation models for edge robotics", "confidence": 0.74},
+        {"name": "Causal representation learning for climate downscaling", "confidence": 0.69},
+        {"name": "Protein language models for enzyme design", "confidence": 0.66},
+    ]},
+    "questions": {"questions": [
+        "Does federated fine-tuning reduce task error on heterogeneous edge robots?",
+        "Can causal representations improve out-of-distribution climate downscaling?",
+        "Do protein language model embeddings predict enzyme thermostability?",
+    ]},
+    "critic": {"critique": "Small synthetic sample; accuracy is measured on training data.", "confidence": 0.62},
+}
+
+MALFORMED = [
+    '{"domains": [{"name": "Truncated topic", "confidence": 0.',
+    "Sure! Here are some ideas: first, second, third.",
+    '```json\n{"questions": ["unterminated]\n```',
+    '{"critique": "missing confidence"',
+]
+
+
+def _classify(prompt: str) -> str:
+    p = prompt.lower()
+    if "research scout" in p:
+        return "scout"
+    if "research questions" in p:
+        return "questions"
+    if "critique" in p:
+        return "critic"
+    return "text"
+
+
+def _parse_latency(spec: str):
+    kind, _, rest = spec.partition(":")
+    args = [float(a) for a in rest.split(":") if a]
+    kind = kind.strip().lower()
+    if kind == "fixed":
+        return lambda rnd: args[0]
+    if kind == "uniform":
+        return lambda rnd: rnd.uniform(args[0], args[1])
+    if kind == "lognormal":
+        import math
+        mu, sigma = math.log(args[0]), args[1]
+        return lambda rnd: rnd.lognormvariate(mu, sigma)
+    if kind == "exp":
+        return lambda rnd: rnd.expovariate(1.0 / args[0])
+    raise ValueError(f"unknown latency distribution: {spec}")
+
+
+def _tokens(text: str) -> int:
+    # rough chars-per-token estimate, good enough for load shaping
+    return max(1, len(text) // 4)
+
+
+class MockLLM:
+    def __init__(
+        self,
+        latency: str = "lognormal:0.3:0.5",
+        tokens_per_sec: float = 50.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency_spec = latency
+        self._latency = _parse_latency(latency)
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            latency=os.getenv("MOCK_LLM_LATENCY", "lognormal:0.3:0.5"),
+            tokens_per_sec=float(os.getenv("MOCK_LLM_TOKENS_PER_SEC", "50")),
+            error_rate=float(os.getenv("MOCK_LLM_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("MOCK_LLM_RATE_LIMIT_RATE", "0")),
+            malformed_rate=float(os.getenv("MOCK_LLM_MALFORMED_RATE", "0")),
+            seed=int(os.getenv("MOCK_LLM_SEED", "0")),
+        )
+
+    def _rng(self, prompt: str) -> random.Random:
+        # per-prompt call counter keeps outputs reproducible under any interleaving
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            n = self._counts[digest]
+            self._counts[digest] += 1
+        return random.Random(f"{self.seed}:{digest}:{n}")
+
+    def respond(self, payload: dict):
+        """
+        Decide the outcome of one call without sleeping.
+        Returns (status_code, body_dict, delay_seconds).
+        """
+        messages = payload.get("messages") or [{}]
+        prompt = str(messages[-1].get("content", ""))
+        model = payload.get("model", "mock")
+        rnd = self._rng(prompt)
+        delay = max(0.0, self._latency(rnd))
+
+        roll = rnd.random()
+        if roll < self.rate_limit_rate:
+            return 429, {"error": {"code": 429, "message": "Rate limit exceeded (mock)"}}, delay
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500, {"error": {"code": 500, "message": "Internal error (mock)"}}, delay
+
+        kind = _classify(prompt)
+        if rnd.random() < self.malformed_rate:
+            content = rnd.choice(MALFORMED)
+        elif kind in CANNED:
+            content = "```json\n" + json.dumps(CANNED[kind]) + "\n```"
+        else:
+            content = "Mock response."
+
+        max_tokens = int(payload.get("max_tokens") or 512)
+        completion_tokens = min(_tokens(content), max_tokens)
+        if self.tokens_per_sec > 0:
+            delay += completion_tokens / self.tokens_per_sec
+
+        body = {
+            "id": f"mock-{rnd.getrandbits(48):012x}",
+            "object": "chat.completion",
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": _tokens(prompt),
+                "completion_tokens": completion_tokens,
+                "total_tokens": _tokens(prompt) + completion_tokens,
+            },
+        }
+        return 200, body, delay
+
+    async def complete(self, payload: dict):
+        """
+        Async equivalent of one HTTP round trip: returns (status_code, raw_text).
+        """
+        status, body, delay = self.respond(payload)
+        await asyncio.sleep(delay)
+        return status, json.dumps(body)
+
+
+_mock = None
+
+
+def get_mock_llm() -> MockLLM:
+    global _mock
+    if _mock is None:
+        _mock = MockLLM.from_env()
+    return _mock
+
+
+def create_app(mock: MockLLM = None):
+    """
+    FastAPI app serving POST /api/v1/chat/completions backed by MockLLM.
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import Response
+
+    mock = mock or MockLLM.from_env()
+    app = FastAPI(title="Mock LLM")
+
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        status, raw = await mock.complete(await request.json())
+        headers = {"Retry-After": "1"} if status == 429 else {}
+        return Response(raw, status_code=status, media_type="application/json", headers=headers)
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the mock OpenRouter server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    uvicorn.run(create_app(), host=args.host, port=args.port)
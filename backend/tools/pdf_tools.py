@@ -1,6 +1,9 @@
 # backend/tools/pdf_tools.py
 import io
 import logging
+
+from .serialization import dumps_pretty
+
 logger = logging.getLogger(__name__)
 
 def extract_text_from_pdf_bytes(pdf_bytes) -> str:
@@ -38,7 +41,9 @@ def ocr_image_bytes(image_bytes) -> str:
 # ------------------------
 # New helpers below:
 # ------------------------
-def markdown_from_paper(paper: dict) -> str:
+def markdown_from_paper(paper) -> str:
+    if hasattr(paper, "to_dict"):
+        paper = paper.to_dict()
     title = paper.get("title", "Untitled")
     abstract = paper.get("abstract", "")
     results = paper.get("results", {})
@@ -49,20 +54,19 @@ def markdown_from_paper(paper: dict) -> str:
     md_lines.append("## Abstract\n")
     md_lines.append(abstract + "\n")
     md_lines.append("## Results\n")
-    import json
     md_lines.append("```json")
-    md_lines.append(json.dumps(results, indent=2))
+    md_lines.append(dumps_pretty(results))
     md_lines.append("```\n")
     md_lines.append("## Critic\n")
     md_lines.append("```json")
-    md_lines.append(json.dumps(critique, indent=2))
+    md_lines.append(dumps_pretty(critique))
     md_lines.append("```\n")
 
     meta = paper.get("meta")
     if meta:
         md_lines.append("## Meta\n")
         md_lines.append("```json")
-        md_lines.append(json.dumps(meta, indent=2))
+        md_lines.append(dumps_pretty(meta))
         md_lines.append("```\n")
 
     return "\n".join(md_lines)
@@ -77,7 +81,8 @@ def generate_pdf_from_text(text: str) -> bytes:
         raise
 
     buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
+    # invariant=1: no creation timestamp / random document id, so equal text gives equal bytes
+    c = canvas.Canvas(buffer, pagesize=letter, invariant=1)
     width, height = letter
     left_margin = inch
     top = height - inch
@@ -0,0 +1,137 @@
+# backend/tools/render_cache.py
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+from . import telemetry
+from .pdf_tools import markdown_from_paper, generate_pdf_from_text
+from .serialization import dumps, dumps_msgpack, JSON_MEDIA_TYPE
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    "md": "text/markdown",
+    "pdf": "application/pdf",
+}
+
+
+class RenderCache:
+    """
+    Caches rendered paper downloads per (run_id, format, version).
+
+    The version is bumped by the orchestrator every time a run's paper is
+    (re)written, so a stale entry can never be served for a newer paper.
+    The ETag is derived from the paper's Markdown plus the format, not the
+    rendered bytes, so it is stable across re-renders, restarts and workers.
+    """
+
+    # label for the cache_requests_total metric
+    name = "render"
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _etag(md: str, fmt: str) -> str:
+        return '"' + hashlib.sha256(f"{fmt}\n{md}".encode("utf-8")).hexdigest()[:32] + '"'
+
+    def etag(self, run_id: str, fmt: str, version: int, paper: dict) -> str:
+        """
+        The ETag a download would carry, without rendering it (Markdown only),
+        so a matching If-None-Match can be answered even after eviction.
+        """
+        with self._lock:
+            entry = self._entries.get((run_id, fmt, version))
+        if entry is not None:
+            return entry[1]
+        return self._etag(markdown_from_paper(paper), fmt)
+
+    def _render(self, paper: dict, fmt: str):
+        md = markdown_from_paper(paper)
+        etag = self._etag(md, fmt)
+        if fmt == "md":
+            return md.encode("utf-8"), etag
+        if fmt == "pdf":
+            return generate_pdf_from_text(md), etag
+        raise ValueError(f"unsupported format: {fmt}")
+
+    def peek(self, run_id: str, fmt: str, version: int):
+        """
+        Return the cached (body, etag) or None without rendering.
+        """
+        key = (run_id, fmt, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        telemetry.cache_lookup(self.name, entry is not None)
+        return entry
+
+    def get(self, run_id: str, fmt: str, version: int, paper: dict):
+        """
+        Return (body, etag), rendering and caching on a miss.
+        Rendering happens outside the lock so slow PDF layouts don't serialize readers.
+        """
+        entry = self.peek(run_id, fmt, version)
+        if entry is not None:
+            return entry
+
+        entry = self._render(paper, fmt)
+
+        with self._lock:
+            self._entries[(run_id, fmt, version)] = entry
+            self._entries.move_to_end((run_id, fmt, version))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, run_id: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == run_id]:
+                del self._entries[key]
+
+    def prerender(self, run_id: str, version: int, paper: dict, formats=("md", "pdf")):
+        """
+        Warm the cache for a freshly completed run. Meant to run in an executor.
+        Failures (e.g. reportlab missing) are logged and otherwise ignored;
+        the download endpoint will surface them on demand.
+        """
+        for fmt in formats:
+            try:
+                self.get(run_id, fmt, version, paper)
+            except Exception as e:
+                logger.warning("prerender %s failed for %s: %s", fmt, run_id, e)
+
+
+class ResultCache(RenderCache):
+    """
+    Encoded /result bodies per (run_id, media type, version), so repeated polls
+    of a finished run skip re-encoding. Entries are (body, None): /result has no ETag.
+    """
+
+    name = "result"
+
+    def _render(self, paper, media_type: str):
+        if media_type == JSON_MEDIA_TYPE:
+            return dumps(paper), None
+        return dumps_msgpack(paper), None
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header value against an ETag (weak comparison).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,156 @@
+# backend/tools/run_store.py
+import os
+import time
+import logging
+import threading
+
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Set RUN_STORE_DIR="" to keep runs in memory only (nothing survives a restart)
+RUN_STORE_DIR = os.getenv("RUN_STORE_DIR", os.path.join(".cache", "runs"))
+
+# Retention: runs not written for RUN_STORE_TTL seconds are deleted, and only the
+# newest RUN_STORE_MAX_RECORDS are kept (memory and disk). 0 disables either limit.
+RUN_STORE_TTL = float(os.getenv("RUN_STORE_TTL", str(7 * 24 * 3600)))
+RUN_STORE_MAX_RECORDS = int(os.getenv("RUN_STORE_MAX_RECORDS", "1000"))
+
+# Records parsed at startup (newest first); older ones are loaded on first access
+RUN_STORE_PRELOAD = int(os.getenv("RUN_STORE_PRELOAD", "100"))
+
+
+class RunStore:
+    """
+    Persistent run records: one JSON file per run.
+
+    Record shape:
+        {"run_id", "checkpoints": {stage: output}, "paper",
+         "status": {"phase", "mode", "logs", "usage", "budget", "created_at", ...}}
+
+    Records are kept in memory and written through to disk atomically, so a
+    restarted worker can reload them and resume from the last checkpoint.
+    Only the newest `preload` records are read at startup; the rest stay on
+    disk until load() asks for them. prune() applies the retention limits.
+    """
+
+    def __init__(self, root: str = RUN_STORE_DIR, ttl: float = RUN_STORE_TTL,
+                 max_records: int = RUN_STORE_MAX_RECORDS, preload: int = RUN_STORE_PRELOAD):
+        self.root = root or None
+        self.ttl = ttl
+        self.max_records = max_records
+        self.preload = preload
+        self.records = {}
+        # run_id -> last write time, for every known run (loaded or only on disk)
+        self.touched = {}
+        self._lock = threading.Lock()
+        if self.root:
+            os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, run_id):
+        return os.path.join(self.root, f"{run_id}.json")
+
+    def _read(self, run_id):
+        try:
+            with open(self._path(run_id), "rb") as f:
+                return loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning("Skipping unreadable run record %s: %s", run_id, e)
+            return None
+
+    def load_recent(self):
+        """
+        Index every record on disk (a stat per file, no parsing), apply retention,
+        then load the newest `preload` records into memory and return them.
+        """
+        if not self.root:
+            return {}
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            try:
+                self.touched[name[:-5]] = os.path.getmtime(os.path.join(self.root, name))
+            except OSError:
+                pass
+        self.prune()
+        newest = sorted(self.touched, key=self.touched.get, reverse=True)[:self.preload]
+        loaded = {}
+        for run_id in newest:
+            record = self.load(run_id)
+            if record is not None:
+                loaded[run_id] = record
+        return loaded
+
+    def load(self, run_id):
+        """
+        Return a record, reading it from disk if it is known but not loaded yet.
+        """
+        record = self.records.get(run_id)
+        if record is not None or not self.root or run_id not in self.touched:
+            return record
+        record = self._read(run_id)
+        if record is not None and "status" in record:
+            self.records[run_id] = record
+            return record
+        return None
+
+    def get(self, run_id):
+        return self.records.get(run_id)
+
+    def create(self, run_id, **fields):
+        record = {"run_id": run_id, "checkpoints": {}, "paper": None, **fields}
+        self.records[run_id] = record
+        self.touched[run_id] = time.time()
+        return record
+
+    def prune(self, keep=()):
+        """
+        Delete records past the TTL or beyond max_records (oldest first), except
+        run ids in `keep` (e.g. active runs). Returns the deleted run ids.
+        """
+        now = time.time()
+        by_age = sorted(self.touched, key=self.touched.get, reverse=True)
+        expired = []
+        for n, run_id in enumerate(by_age):
+            if run_id in keep:
+                continue
+            too_old = self.ttl and now - self.touched[run_id] > self.ttl
+            too_many = self.max_records and n >= self.max_records
+            if too_old or too_many:
+                expired.append(run_id)
+        for run_id in expired:
+            self.records.pop(run_id, None)
+            self.touched.pop(run_id, None)
+            if self.root:
+                try:
+                    os.remove(self._path(run_id))
+                except OSError:
+                    pass
+        if expired:
+            logger.info("Pruned %d run records", len(expired))
+        return expired
+
+    def snapshot(self, run_id):
+        """
+        Serialize a record to JSON bytes. Call on the event loop thread: the record
+        shares its logs/usage with the live status, which only the loop mutates.
+        """
+        record = self.records.get(run_id)
+        if record is None:
+            return None
+        self.touched[run_id] = time.time()
+        if not self.root:
+            return None
+        return dumps(record)
+
+    def write(self, run_id, data):
+        """
+        Atomically write a snapshot to disk (blocking; run it in an executor).
+        """
+        if data is None:
+            return
+        with self._lock:
+            tmp = self._path(run_id) + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(run_id))
@@ -1,16 +1,60 @@
 # backend/tools/scraper.py
+from urllib.parse import urljoin
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import logging
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "agentic-bot/0.1"
+
+_parser = None
+
+
+def _get_parser():
+    """
+    Pick the html parser on first use rather than at import, so importing this
+    module stays cheap: selectolax (lexbor) > bs4 with lxml > bs4 with html.parser.
+    Returns a callable html -> ("fast", tree) or ("bs4", soup).
+    """
+    global _parser
+    if _parser is not None:
+        return _parser
+    try:
+        from selectolax.lexbor import LexborHTMLParser as fast
+    except Exception:
+        try:
+            from selectolax.parser import HTMLParser as fast
+        except Exception:
+            fast = None
+    if fast is not None:
+        _parser = lambda html: ("fast", fast(html))
+        return _parser
+
+    from bs4 import BeautifulSoup
+    try:
+        import lxml  # noqa: F401
+        features = "lxml"
+    except Exception:
+        features = "html.parser"
+    _parser = lambda html: ("bs4", BeautifulSoup(html, features))
+    return _parser
+
+# One pooled session per process so repeated fetches reuse TCP/TLS connections.
+_session = requests.Session()
+_session.headers.update({"User-Agent": USER_AGENT})
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
 def fetch_simple(url, timeout=10):
     """
     Simple requests-based fetch. Good for static pages and small scrapes.
+    Blocking: from async code use tools.crawler.AsyncCrawler instead.
     """
     try:
-        r = requests.get(url, timeout=timeout, headers={"User-Agent": "agentic-bot/0.1"})
+        r = _session.get(url, timeout=timeout)
         r.raise_for_status()
         return r.text
     except Exception as e:
@@ -20,15 +64,43 @@ def fetch_simple(url, timeout=10):
 def parse_links(html, base_url=None):
     """
     Return list of (text, href) from html.
+    If base_url is given, relative hrefs are resolved against it.
     """
-    soup = BeautifulSoup(html, "html.parser")
     links = []
-    for a in soup.find_all("a", href=True):
-        text = (a.get_text() or "").strip()
-        href = a["href"]
-        links.append({"text": text, "href": href})
+    kind, tree = _get_parser()(html)
+    if kind == "fast":
+        for a in tree.css("a[href]"):
+            text = (a.text() or "").strip()
+            href = a.attributes.get("href") or ""
+            links.append({"text": text, "href": href})
+    else:
+        for a in tree.find_all("a", href=True):
+            text = (a.get_text() or "").strip()
+            href = a["href"]
+            links.append({"text": text, "href": href})
+
+    if base_url:
+        for link in links:
+            link["href"] = urljoin(base_url, link["href"])
     return links
 
+def html_to_text(html):
+    """
+    Visible text of an html page (scripts/styles dropped), whitespace-collapsed.
+    """
+    if not html:
+        return ""
+    kind, tree = _get_parser()(html)
+    if kind == "fast":
+        tree.strip_tags(["script", "style", "noscript"])
+        body = tree.body or tree.root
+        text = body.text(separator=" ") if body is not None else ""
+    else:
+        for tag in tree(["script", "style", "noscript"]):
+            tag.decompose()
+        text = tree.get_text(" ")
+    return " ".join(text.split())
+
 # Playwright example (commented): uncomment and use when playwright is installed.
 # from playwright.sync_api import sync_playwright
 # def fetch_with_playwright(url, headless=True, timeout=30000):
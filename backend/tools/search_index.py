@@ -0,0 +1,407 @@
+# backend/tools/search_index.py
+import os
+import re
+import json
+import math
+import mmap
+import heapq
+import hashlib
+import logging
+import threading
+from array import array
+from collections import Counter, defaultdict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = os.getenv("SEARCH_INDEX_DIR", os.path.join(".cache", "index"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the to was were with".split()
+)
+
+
+def tokenize(text: str):
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+class _Segment:
+    """
+    Immutable on-disk segment.
+      <name>.post   flat uint32 array of (docnum, tf) pairs, grouped by term
+      <name>.terms  json {term: [pair_offset, pair_count]}
+    The postings file is memory-mapped, so only touched pages are read.
+    """
+
+    def __init__(self, root, name):
+        self.name = name
+        with open(os.path.join(root, name + ".terms"), "r", encoding="utf-8") as f:
+            self.terms = json.load(f)
+        self._file = open(os.path.join(root, name + ".post"), "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._ints = memoryview(self._mm).cast("I")
+        else:
+            self._mm = None
+            self._ints = memoryview(b"").cast("I")
+
+    def df(self, term):
+        entry = self.terms.get(term)
+        return entry[1] if entry else 0
+
+    def postings(self, term):
+        entry = self.terms.get(term)
+        if not entry:
+            return
+        start, count = entry
+        ints = self._ints
+        for i in range(2 * start, 2 * (start + count), 2):
+            yield ints[i], ints[i + 1]
+
+    def close(self):
+        self._ints.release()
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    @staticmethod
+    def write(root, name, postings):
+        """
+        postings: {term: [(docnum, tf), ...]}
+        """
+        flat = array("I")
+        terms = {}
+        for term in sorted(postings):
+            plist = postings[term]
+            terms[term] = [len(flat) // 2, len(plist)]
+            for docnum, tf in plist:
+                flat.append(docnum)
+                flat.append(tf)
+        with open(os.path.join(root, name + ".post"), "wb") as f:
+            flat.tofile(f)
+        tmp = os.path.join(root, name + ".terms.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(terms, f)
+        os.replace(tmp, os.path.join(root, name + ".terms"))
+
+
+class SearchIndex:
+    """
+    Persistent inverted index with BM25 ranking.
+
+    Documents are added incrementally to an in-memory buffer that is flushed to a
+    new immutable segment every `flush_every` documents, `flush_interval` seconds
+    after the first unflushed change, and on flush()/close().
+    Re-adding a doc_id tombstones the previous version (unless text, url and
+    title are unchanged, in which case it is a no-op). compact() merges all
+    segments into one and drops deleted documents; flush() runs it by itself once
+    there are more than `max_segments` segments or more than `max_deleted_ratio`
+    of the doc table is tombstoned.
+
+    search(query, k) returns result dicts compatible with tools.web_search
+    ({"title", "url", "snippet"} plus "doc_id" and "score").
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, root: str = DEFAULT_INDEX_DIR, flush_every: int = 200, flush_interval: float = 5.0,
+                 max_segments: int = 8, max_deleted_ratio: float = 0.3):
+        self.root = root
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.max_segments = max_segments
+        self.max_deleted_ratio = max_deleted_ratio
+        self._timer = None
+        self._lock = threading.RLock()
+        os.makedirs(root, exist_ok=True)
+
+        manifest = self._read_json("manifest.json", {"segments": [], "next_segment": 0})
+        self._next_segment = manifest["next_segment"]
+        # compaction renumbers docs, so each compacted generation gets its own
+        # doc table file and the manifest switches to it atomically
+        self._docs_name = manifest.get("docs", "docs.json")
+        self._docs = self._read_json(self._docs_name, [])
+        self._by_id = {d["id"]: n for n, d in enumerate(self._docs) if not d.get("deleted")}
+        self._deleted = len(self._docs) - len(self._by_id)
+        # running sum of live doc lengths, for BM25's avgdl
+        self._total_len = sum(self._docs[n]["len"] for n in self._by_id.values())
+        self._segments = [_Segment(root, name) for name in manifest["segments"]]
+        self._buffer = defaultdict(list)
+        self._buffered = 0
+
+    # ------------------------
+    # persistence helpers
+    # ------------------------
+    def _read_json(self, name, default):
+        try:
+            with open(os.path.join(self.root, name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    def _write_json(self, name, value):
+        tmp = os.path.join(self.root, name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp, os.path.join(self.root, name))
+
+    def _write_manifest(self):
+        # docs first: a manifest never references docnums missing from the doc table
+        self._write_json(self._docs_name, self._docs)
+        self._write_json("manifest.json", {
+            "segments": [s.name for s in self._segments],
+            "next_segment": self._next_segment,
+            "docs": self._docs_name,
+        })
+
+    def _remove(self, name):
+        try:
+            os.remove(os.path.join(self.root, name))
+        except OSError:
+            pass
+
+    # ------------------------
+    # writes
+    # ------------------------
+    def add_document(self, doc_id: str, text: str, url: str = "", title: str = ""):
+        text = text or ""
+        title = title or url or doc_id
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        with self._lock:
+            old = self._by_id.get(doc_id)
+            if old is not None:
+                prev = self._docs[old]
+                if prev.get("hash") == digest and prev["url"] == url and prev["title"] == title:
+                    return old
+                self._tombstone(old)
+
+            tokens = tokenize(text)
+            docnum = len(self._docs)
+            snippet = " ".join(text.split())[:200]
+            self._docs.append({
+                "id": doc_id,
+                "url": url,
+                "title": title,
+                "snippet": snippet,
+                "len": len(tokens),
+                "hash": digest,
+            })
+            self._by_id[doc_id] = docnum
+            self._total_len += len(tokens)
+
+            for term, tf in Counter(tokens).items():
+                self._buffer[term].append((docnum, tf))
+            self._buffered += 1
+            if self._buffered >= self.flush_every:
+                self.flush()
+            else:
+                self._schedule_flush()
+        return docnum
+
+    def delete_document(self, doc_id: str):
+        with self._lock:
+            docnum = self._by_id.pop(doc_id, None)
+            if docnum is not None:
+                self._tombstone(docnum)
+                self._schedule_flush()
+
+    def _tombstone(self, docnum):
+        doc = self._docs[docnum]
+        doc["deleted"] = True
+        self._deleted += 1
+        self._total_len -= doc["len"]
+
+    def _schedule_flush(self):
+        # bound how long an unflushed change can live only in memory
+        if self._timer is None and self.flush_interval:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """
+        Write buffered documents as a new segment and persist the doc table,
+        compacting first if the merge policy says so.
+        """
+        with self._lock:
+            self._cancel_timer()
+            if self._needs_compaction(extra_segment=bool(self._buffer)):
+                self._compact()
+                return
+            if self._buffer:
+                self._segments.append(self._write_segment(self._buffer))
+                self._buffer = defaultdict(list)
+                self._buffered = 0
+            self._write_manifest()
+
+    def compact(self):
+        """
+        Merge all segments (and the buffer) into a single segment and drop
+        deleted documents from the doc table.
+        """
+        with self._lock:
+            self._cancel_timer()
+            self._compact()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _needs_compaction(self, extra_segment=False):
+        if len(self._segments) + extra_segment > self.max_segments:
+            return True
+        return bool(self._docs) and self._deleted / len(self._docs) > self.max_deleted_ratio
+
+    def _write_segment(self, postings):
+        name = f"seg_{self._next_segment:06d}"
+        self._next_segment += 1
+        _Segment.write(self.root, name, postings)
+        return _Segment(self.root, name)
+
+    def _compact(self):
+        # live docs are renumbered densely; postings follow the new numbers
+        renumber = {}
+        docs = []
+        for docnum, doc in enumerate(self._docs):
+            if not doc.get("deleted"):
+                renumber[docnum] = len(docs)
+                docs.append(doc)
+
+        merged = defaultdict(list)
+        for seg in self._segments:
+            for term in seg.terms:
+                merged[term].extend(
+                    (renumber[docnum], tf) for docnum, tf in seg.postings(term) if docnum in renumber
+                )
+        for term, plist in self._buffer.items():
+            merged[term].extend((renumber[docnum], tf) for docnum, tf in plist if docnum in renumber)
+
+        old_segments, old_docs_name = self._segments, self._docs_name
+        self._segments = [self._write_segment({t: p for t, p in merged.items() if p})]
+        self._docs_name = f"docs_{self._next_segment - 1:06d}.json"
+        self._docs = docs
+        self._by_id = {d["id"]: n for n, d in enumerate(docs)}
+        self._deleted = 0
+        self._buffer = defaultdict(list)
+        self._buffered = 0
+        self._write_manifest()
+
+        for seg in old_segments:
+            seg.close()
+            self._remove(seg.name + ".post")
+            self._remove(seg.name + ".terms")
+        if old_docs_name != self._docs_name:
+            self._remove(old_docs_name)
+        logger.info("Compacted search index: %d segments -> 1, %d docs", len(old_segments), len(docs))
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for seg in self._segments:
+                seg.close()
+            self._segments = []
+
+    # ------------------------
+    # reads
+    # ------------------------
+    def __len__(self):
+        return len(self._by_id)
+
+    def search(self, query: str, k: int = 10):
+        terms = set(tokenize(query or ""))
+        if not terms:
+            return []
+
+        with self._lock:
+            docs = self._docs
+            n_docs = len(self._by_id)
+            if not n_docs:
+                return []
+            avgdl = self._total_len / n_docs or 1.0
+
+            scores = defaultdict(float)
+            for term in terms:
+                sources = [seg.postings(term) for seg in self._segments if seg.df(term)]
+                if term in self._buffer:
+                    sources.append(iter(self._buffer[term]))
+                # df includes tombstoned postings until compact(); that only nudges idf
+                df = sum(seg.df(term) for seg in self._segments) + len(self._buffer.get(term, ()))
+                if not df:
+                    continue
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for postings in sources:
+                    for docnum, tf in postings:
+                        doc = docs[docnum]
+                        if doc.get("deleted"):
+                            continue
+                        norm = tf + self.k1 * (1 - self.b + self.b * doc["len"] / avgdl)
+                        scores[docnum] += idf * tf * (self.k1 + 1) / norm
+
+            top = heapq.nlargest(k, scores.items(), key=lambda kv: kv[1])
+            return [
+                {
+                    "doc_id": docs[n]["id"],
+                    "title": docs[n]["title"],
+                    "url": docs[n]["url"],
+                    "snippet": docs[n]["snippet"],
+                    "score": round(score, 4),
+                }
+                for n, score in top
+            ]
+
+
+# ------------------------
+# Ingestion helpers
+# ------------------------
+def index_html(index: SearchIndex, url: str, html: str, title: str = ""):
+    from .scraper import html_to_text
+    text = html_to_text(html)
+    if text:
+        index.add_document(url, text, url=url, title=title)
+    return bool(text)
+
+
+def index_url(index: SearchIndex, url: str):
+    """
+    Fetch a page with scraper.fetch_simple and add its text to the index (blocking).
+    """
+    from .scraper import fetch_simple
+    html = fetch_simple(url)
+    return index_html(index, url, html) if html else False
+
+
+def index_pdf_bytes(index: SearchIndex, doc_id: str, pdf_bytes: bytes, url: str = "", title: str = ""):
+    from .pdf_tools import extract_text_from_pdf_bytes
+    text = extract_text_from_pdf_bytes(pdf_bytes)
+    if text:
+        index.add_document(doc_id, text, url=url, title=title)
+    return bool(text)
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_index() -> SearchIndex:
+    """
+    Process-wide index at SEARCH_INDEX_DIR, opened on first use.
+    """
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = SearchIndex(DEFAULT_INDEX_DIR)
+        return _default_index
+
+
+def close_index():
+    """
+    Flush and close the process-wide index if it was opened (call on shutdown).
+    """
+    global _default_index
+    with _default_lock:
+        if _default_index is not None:
+            _default_index.close()
+            _default_index = None
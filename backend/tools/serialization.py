@@ -0,0 +1,95 @@
+# backend/tools/serialization.py
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Optional fast encoders: orjson for JSON (stdlib json fallback), msgpack for binary responses
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+try:
+    import msgpack
+except Exception:
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else 0
+
+
+def _default(obj):
+    """
+    Encode typed models (anything with to_dict) and numpy scalars/arrays; str() the rest.
+    """
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+def dumps(obj) -> bytes:
+    """
+    Compact JSON as UTF-8 bytes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTS)
+        except TypeError:
+            # e.g. ints beyond 64 bits; the stdlib encoder handles those
+            pass
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_pretty(obj) -> str:
+    """
+    Two-space indented JSON text (used for the Markdown paper).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTS | orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, default=_default, ensure_ascii=False, indent=2)
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_msgpack(obj) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def negotiate(accept: str) -> str:
+    """
+    Pick the response media type from an Accept header: msgpack if the client
+    lists it (and msgpack is installed) with a q-value not below JSON's, else JSON.
+    """
+    if not accept or msgpack is None:
+        return JSON_MEDIA_TYPE
+    best, best_q = JSON_MEDIA_TYPE, -1.0
+    for part in accept.split(","):
+        fields = part.strip().split(";")
+        media = fields[0].strip().lower()
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media in MSGPACK_MEDIA_TYPES and q > 0 and q >= best_q:
+            best, best_q = MSGPACK_MEDIA_TYPES[0], q
+        elif media in (JSON_MEDIA_TYPE, "application/*", "*/*") and q > best_q:
+            best, best_q = JSON_MEDIA_TYPE, q
+    return best
@@ -0,0 +1,243 @@
+# backend/tools/telemetry.py
+import os
+import json
+import atexit
+import time
+import uuid
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# Optional OpenTelemetry-style span export (one JSON object per line)
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HELP = {
+    "pipeline_run_duration_seconds": "End-to-end pipeline run duration.",
+    "pipeline_stage_duration_seconds": "Duration of each pipeline stage.",
+    "llm_request_duration_seconds": "LLM call duration including retries.",
+    "llm_queue_wait_seconds": "Time an LLM call waited for a concurrency slot.",
+    "llm_tokens_total": "LLM tokens by direction (prompt/completion).",
+    "llm_retries_total": "LLM call retries.",
+    "llm_cost_usd_total": "Estimated LLM spend in USD.",
+    "cache_requests_total": "Cache lookups by cache and result (hit/miss).",
+}
+
+current_run = ContextVar("current_run", default=None)
+current_span = ContextVar("current_span", default=None)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _fmt_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    def esc(v):
+        return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+
+class Metrics:
+    """
+    Minimal thread-safe metrics registry rendered in Prometheus text format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, name, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name, value=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                if name in HELP:
+                    lines.append(f"# HELP {name} {HELP[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_fmt_labels(key)} {value}")
+            for name in sorted(self._histograms):
+                if name in HELP:
+                    lines.append(f"# HELP {name} {HELP[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, n in zip(hist.buckets, hist.counts):
+                        cumulative += n
+                        lines.append(f"{name}_bucket{_fmt_labels(key, [('le', repr(bound))])} {cumulative}")
+                    lines.append(f"{name}_bucket{_fmt_labels(key, [('le', '+Inf')])} {hist.count}")
+                    lines.append(f"{name}_sum{_fmt_labels(key)} {hist.sum}")
+                    lines.append(f"{name}_count{_fmt_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+class Span:
+    """
+    A timed unit of work. `labels` become metric labels (keep them low-cardinality);
+    `attrs` are only exported with the trace.
+    """
+
+    __slots__ = ("name", "labels", "attrs", "trace_id", "span_id", "parent_id",
+                 "start_ns", "end_ns", "_t0", "duration", "error")
+
+    def __init__(self, name, labels=None, attrs=None, parent=None):
+        self.name = name
+        self.labels = dict(labels or {})
+        self.attrs = dict(attrs or {})
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self._t0 = time.perf_counter()
+        self.duration = None
+        self.error = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self):
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": {**self.labels, **self.attrs},
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+class _TraceWriter:
+    """
+    Appends exported spans to TRACE_EXPORT_PATH from a background thread, so
+    span exit only enqueues a dict (no file I/O on the event loop).
+    The file is opened once and flushed whenever the queue drains.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, item):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                    self._thread.start()
+        self._queue.put(item)
+
+    def _run(self):
+        try:
+            f = open(self.path, "a", encoding="utf-8")
+        except OSError as e:
+            logger.warning("trace export disabled, cannot open %s: %s", self.path, e)
+            return
+        with f:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                try:
+                    f.write(json.dumps(item, default=str) + "\n")
+                    if self._queue.empty():
+                        f.flush()
+                except Exception as e:
+                    logger.warning("trace export failed: %s", e)
+
+    def close(self, timeout=2.0):
+        """
+        Write out queued spans and stop the thread (registered atexit).
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+_writer = _TraceWriter(TRACE_EXPORT_PATH) if TRACE_EXPORT_PATH else None
+if _writer is not None:
+    atexit.register(_writer.close)
+
+
+def _export(span):
+    if _writer is not None:
+        _writer.put(span.to_dict())
+
+
+@contextmanager
+def span(name, labels=None, **attrs):
+    """
+    Time a block (sync or inside a coroutine) as a child of the current span.
+    On exit the duration is observed into the `<name>_duration_seconds`
+    histogram with `labels`, and the span is exported if TRACE_EXPORT_PATH is set.
+    """
+    run_id = current_run.get()
+    if run_id is not None:
+        attrs.setdefault("run_id", run_id)
+    s = Span(name, labels, attrs, parent=current_span.get())
+    token = current_span.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = repr(e)
+        raise
+    finally:
+        current_span.reset(token)
+        s.duration = time.perf_counter() - s._t0
+        s.end_ns = s.start_ns + int(s.duration * 1e9)
+        metrics.observe(f"{name}_duration_seconds", s.duration, **s.labels)
+        _export(s)
+
+
+def cache_lookup(cache: str, hit: bool):
+    metrics.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+    s = current_span.get()
+    if s is not None:
+        s.attrs[f"cache.{cache}.hit"] = hit
@@ -0,0 +1,108 @@
+# backend/tools/usage.py
+import os
+import json
+import time
+import logging
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens (prompt, completion). Override/extend with LLM_PRICES='{"model": [p, c]}'.
+MODEL_PRICES = {
+    "deepseek/deepseek-r1": (0.55, 2.19),
+    "deepseek/deepseek-chat": (0.27, 1.10),
+    "openai/gpt-4o-mini": (0.15, 0.60),
+}
+try:
+    MODEL_PRICES.update({k: tuple(v) for k, v in json.loads(os.getenv("LLM_PRICES", "{}")).items()})
+except Exception as e:
+    logger.warning("Ignoring invalid LLM_PRICES: %s", e)
+
+# Cheaper model used once a run approaches its budget
+LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "deepseek/deepseek-chat")
+# Fraction of any budget at which the orchestrator starts saving (downgrade model, skip critic)
+BUDGET_SOFT_LIMIT = float(os.getenv("BUDGET_SOFT_LIMIT", "0.8"))
+
+# Set by the orchestrator around each stage; read by llm_client.generate()
+current_agent = ContextVar("current_agent", default=None)
+model_override = ContextVar("model_override", default=None)
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens) -> float:
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1e6
+
+
+def _empty():
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+
+
+def _add(totals, prompt_tokens, completion_tokens, cost):
+    totals["calls"] += 1
+    totals["prompt_tokens"] += prompt_tokens
+    totals["completion_tokens"] += completion_tokens
+    totals["cost_usd"] = round(totals["cost_usd"] + cost, 8)
+
+
+class UsageLedger:
+    """
+    Per-run token/cost totals with a per-agent and per-model breakdown.
+    The dict returned by open() is live: it is updated in place as calls complete.
+    """
+
+    def __init__(self):
+        self.runs = {}
+
+    def open(self, run_id):
+        if run_id not in self.runs:
+            self.runs[run_id] = {**_empty(), "by_agent": {}, "by_model": {}}
+        return self.runs[run_id]
+
+    def record(self, run_id, agent, model, prompt_tokens, completion_tokens, cost):
+        if run_id is None:
+            return
+        totals = self.open(run_id)
+        _add(totals, prompt_tokens, completion_tokens, cost)
+        _add(totals["by_agent"].setdefault(agent or "unknown", _empty()), prompt_tokens, completion_tokens, cost)
+        _add(totals["by_model"].setdefault(model, _empty()), prompt_tokens, completion_tokens, cost)
+
+    def get(self, run_id):
+        return self.runs.get(run_id)
+
+
+ledger = UsageLedger()
+
+
+class Budget:
+    """
+    Optional per-run limits. Any limit left as None is unbounded.
+    """
+
+    def __init__(self, max_tokens=None, max_cost_usd=None, max_seconds=None):
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.max_seconds = max_seconds
+        self.started = time.monotonic()
+
+    def __bool__(self):
+        return any(v is not None for v in (self.max_tokens, self.max_cost_usd, self.max_seconds))
+
+    def fraction_used(self, totals) -> float:
+        """
+        Largest fraction consumed across the configured limits (0.0 when unbounded).
+        """
+        fractions = [0.0]
+        if self.max_tokens:
+            fractions.append((totals["prompt_tokens"] + totals["completion_tokens"]) / self.max_tokens)
+        if self.max_cost_usd:
+            fractions.append(totals["cost_usd"] / self.max_cost_usd)
+        if self.max_seconds:
+            fractions.append((time.monotonic() - self.started) / self.max_seconds)
+        return max(fractions)
+
+    def to_dict(self):
+        return {
+            "max_tokens": self.max_tokens,
+            "max_cost_usd": self.max_cost_usd,
+            "max_seconds": self.max_seconds,
+        }
@@ -1,13 +1,19 @@
 # backend/tools/web_search.py
+import os
 import time
+import asyncio
 import logging
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+from . import telemetry
 
 logger = logging.getLogger(__name__)
 
 def simple_search_stub(query, max_results=5):
     """
     Placeholder search function.
-    Replace or extend this to call SerpAPI/Tavily/generic API.
+    Blocking (time.sleep) - kept for scripts; async code should use StubSearchProvider.
     """
     logger.info("Running stub search for: %s", query)
     time.sleep(0.3)
@@ -16,3 +22,272 @@ def simple_search_stub(query, max_results=5):
         {"title": f"Result {i+1} for {query}", "url": f"https://example.com/{i+1}", "snippet": f"Snippet {i+1}"}
         for i in range(max_results)
     ]
+
+
+# ------------------------
+# Rate limiting / caching
+# ------------------------
+class RateLimiter:
+    """
+    Async token bucket: `rate` requests per second with bursts up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry and LRU eviction.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+
+# ------------------------
+# Providers
+# ------------------------
+class SearchProvider:
+    """
+    Base class. Subclasses implement `_search` returning a list of
+    {"title", "url", "snippet"} dicts; `search` adds rate limiting and
+    never raises (returns [] on failure, like the scraper helpers).
+    """
+
+    name = "base"
+
+    def __init__(self, rate: float = None, burst: int = 1):
+        self.limiter = RateLimiter(rate, burst) if rate else None
+
+    async def search(self, query: str, max_results: int = 5):
+        if self.limiter is not None:
+            await self.limiter.acquire()
+        try:
+            return await self._search(query, max_results)
+        except Exception as e:
+            logger.warning("%s search failed for %r: %s", self.name, query, e)
+            return []
+
+    async def _search(self, query, max_results):
+        raise NotImplementedError
+
+
+class StubSearchProvider(SearchProvider):
+    """
+    Non-blocking version of simple_search_stub.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency: float = 0.3, **kw):
+        super().__init__(**kw)
+        self.latency = latency
+
+    async def _search(self, query, max_results):
+        logger.info("Running stub search for: %s", query)
+        await asyncio.sleep(self.latency)
+        return [
+            {"title": f"Result {i+1} for {query}", "url": f"https://example.com/{i+1}", "snippet": f"Snippet {i+1}"}
+            for i in range(max_results)
+        ]
+
+
+class LocalIndexSearchProvider(SearchProvider):
+    """
+    Searches a local index object exposing `search(query, k)` that returns
+    result dicts. The call runs in the default executor.
+    """
+
+    name = "local"
+
+    def __init__(self, index, **kw):
+        super().__init__(**kw)
+        self.index = index
+
+    async def _search(self, query, max_results):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.index.search, query, max_results)
+
+
+class HttpSearchProvider(SearchProvider):
+    """
+    Generic JSON search API (SerpAPI/Tavily/SearXNG-style).
+    Sends GET {url}?{query_param}=...&{count_param}=N with an optional bearer key and
+    reads results from the first of `results` / `organic_results` / `items` / `data`.
+    """
+
+    name = "http"
+
+    def __init__(self, url: str, api_key: str = None, query_param: str = "q",
+                 count_param: str = "num", timeout: float = 10.0, **kw):
+        super().__init__(**kw)
+        self.url = url
+        self.api_key = api_key
+        self.query_param = query_param
+        self.count_param = count_param
+        self.timeout = timeout
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(headers=headers, timeout=self.timeout)
+        return self._client
+
+    async def _search(self, query, max_results):
+        params = {self.query_param: query, self.count_param: max_results}
+        r = await self.client.get(self.url, params=params)
+        r.raise_for_status()
+        data = r.json()
+
+        items = data
+        if isinstance(data, dict):
+            for key in ("results", "organic_results", "items", "data"):
+                if isinstance(data.get(key), list):
+                    items = data[key]
+                    break
+            else:
+                items = []
+
+        results = []
+        for it in items[:max_results]:
+            if not isinstance(it, dict):
+                continue
+            url = it.get("url") or it.get("link")
+            if not url:
+                continue
+            results.append({
+                "title": it.get("title") or "",
+                "url": url,
+                "snippet": it.get("snippet") or it.get("content") or it.get("description") or "",
+            })
+        return results
+
+
+# ------------------------
+# Fan-out client
+# ------------------------
+def normalize_url(url: str) -> str:
+    """
+    Canonical form used for deduplication (lowercase host, no fragment, no trailing slash).
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+class SearchClient:
+    """
+    Runs many queries against many providers concurrently, caches results per
+    (provider, query, max_results) for `ttl` seconds and deduplicates by URL.
+    """
+
+    def __init__(self, providers, ttl: float = 600.0):
+        self.providers = list(providers)
+        self.cache = TTLCache(ttl=ttl)
+
+    async def _provider_search(self, provider, query, max_results):
+        key = (provider.name, query, max_results)
+        hit = self.cache.get(key)
+        telemetry.cache_lookup("search", hit is not None)
+        if hit is not None:
+            return hit
+        results = await provider.search(query, max_results)
+        if results:
+            self.cache.set(key, results)
+        return results
+
+    async def search(self, query: str, max_results: int = 5):
+        return await self.search_many([query], max_results)
+
+    async def search_many(self, queries, max_results: int = 5):
+        """
+        Returns a deduplicated list of result dicts, each tagged with the
+        `query` and `provider` that first produced it (in query order).
+        """
+        jobs = [(q, p) for q in queries for p in self.providers]
+        batches = await asyncio.gather(
+            *(self._provider_search(p, q, max_results) for q, p in jobs)
+        )
+
+        seen = set()
+        merged = []
+        for (query, provider), results in zip(jobs, batches):
+            for r in results:
+                url = r.get("url")
+                # local documents (e.g. ingested PDFs) may have no URL
+                key = normalize_url(url) if url else ("doc", r.get("doc_id") or r.get("title"))
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.append({**r, "query": query, "provider": provider.name})
+        return merged
+
+
+def get_search_client() -> SearchClient:
+    """
+    Build a SearchClient from env:
+      SEARCH_PROVIDERS   comma list of stub,http,local (default: none, i.e. no
+                         grounding; stub returns fake results, for tests/benchmarks only)
+      SEARCH_API_URL     endpoint for the http provider
+      SEARCH_API_KEY     bearer key for the http provider
+      SEARCH_RATE        max requests/second per provider (default: unlimited)
+      SEARCH_CACHE_TTL   result cache TTL in seconds (default: 600)
+    """
+    names = [n.strip() for n in os.getenv("SEARCH_PROVIDERS", "").split(",") if n.strip()]
+    rate = float(os.getenv("SEARCH_RATE", "0")) or None
+
+    providers = []
+    for name in names:
+        if name == "stub":
+            providers.append(StubSearchProvider(rate=rate))
+        elif name == "local":
+            from .search_index import get_index
+            providers.append(LocalIndexSearchProvider(get_index(), rate=rate))
+        elif name == "http":
+            url = os.getenv("SEARCH_API_URL")
+            if not url:
+                logger.warning("SEARCH_PROVIDERS includes http but SEARCH_API_URL is not set")
+                continue
+            providers.append(HttpSearchProvider(url, api_key=os.getenv("SEARCH_API_KEY"), rate=rate))
+        else:
+            logger.warning("Unknown search provider: %s", name)
+
+    return SearchClient(providers, ttl=float(os.getenv("SEARCH_CACHE_TTL", "600")))
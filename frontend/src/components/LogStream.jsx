@@ -1,19 +1,46 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 
 export default function LogStream() {
   const [logs, setLogs] = useState([]);
+  const [progress, setProgress] = useState(null);
+  // cursor state: which run we are following and the next log seq to ask for
+  const cursor = useRef({ runId: null, nextSeq: 0 });
+  // true while a poll is outstanding; slow responses must not overlap
+  const inFlight = useRef(false);
 
   useEffect(() => {
     const interval = setInterval(async () => {
       const run_id = localStorage.getItem("agent_run_id");
-      if (!run_id) return;
+      if (!run_id || inFlight.current) return;
+      if (cursor.current.runId !== run_id) {
+        cursor.current = { runId: run_id, nextSeq: 0 };
+        setLogs([]);
+        setProgress(null);
+      }
       const base = import.meta.env.VITE_API_URL || "";
+      const since = cursor.current.nextSeq;
+      inFlight.current = true;
       try {
-        const res = await fetch(`${base}/status/${run_id}`);
+        const res = await fetch(`${base}/status/${run_id}?since=${since}`);
         const data = await res.json();
-        setLogs(data.logs || []);
+        // ignore responses for a run we have since switched away from
+        if (cursor.current.runId !== run_id) return;
+        // only entries past the cursor, in case a response is ever replayed
+        const entries = (data.logs || []).filter(
+          (l) => l.seq > cursor.current.nextSeq
+        );
+        if (entries.length > 0) {
+          setLogs((prev) => prev.concat(entries));
+        }
+        cursor.current.nextSeq = Math.max(
+          cursor.current.nextSeq,
+          data.next_seq ?? since
+        );
+        setProgress(data.progress || null);
       } catch (e) {
         // ignore
+      } finally {
+        inFlight.current = false;
       }
     }, 1500);
 
@@ -22,12 +49,17 @@ export default function LogStream() {
 
   return (
     <div className="logbox">
+      {progress && (
+        <div style={{ marginBottom: 8 }}>
+          Progress: {progress.percent}%{progress.stage ? ` (${progress.stage})` : ""}
+        </div>
+      )}
       {logs.length === 0 ? (
         <div>No logs yet. Start a run.</div>
       ) : (
-        logs.map((l, i) => (
-          <div key={i} style={{ marginBottom: 6 }}>
-            {typeof l === "string" ? l : JSON.stringify(l)}
+        logs.map((l) => (
+          <div key={l.seq} style={{ marginBottom: 6 }}>
+            {typeof l.message === "string" ? l.message : JSON.stringify(l.message)}
           </div>
         ))
       )}